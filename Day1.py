@@ -39,7 +39,23 @@
 # Your actual left and right lists contain many location IDs. What is the total distance between your lists?
 ###
 
-import pandas as pd
+import heapq
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import zip_longest
+
+def _import_numpy():
+	# NumPy is optional and slow to import, so it is only loaded by the functions that use it
+	try:
+		import numpy
+	except ImportError:
+		return None
+	return numpy
 
 def list_distance(list1: list, list2: list):
 	distance = 0
@@ -53,6 +69,7 @@ def list_distance(list1: list, list2: list):
 	return distance
 
 def read_lists(file: str):
+	import pandas as pd
 	df = pd.read_csv(file, header = None, sep=r'\s+')
 	list1 = df.iloc[:, 0].to_list()
 	list2 = df.iloc[:, 1].to_list()
@@ -72,8 +89,503 @@ def similarity_score(list1: list, list2: list):
 
 	return similarity_score
 
-def main():
-	list1, list2 = read_lists("Day1_input_lists.txt")
+def read_column(files, column: int):
+	# Stream one column of integers out of one or more whitespace separated files
+	for file in files:
+		with open(file, 'r') as f:
+			for line in f:
+				fields = line.split()
+				if fields:
+					yield int(fields[column])
+
+def write_sorted_runs(values, run_size: int, run_dir: str):
+	"""
+	Splits a stream of integers into sorted runs on disk, holding at most run_size values in memory.
+
+	:param values: Iterable of integers
+	:param run_size: Maximum number of values per run
+	:param run_dir: Directory the run files are written to
+	:return: A list of paths to the sorted run files
+	"""
+	run_files = []
+	run = []
+	for value in values:
+		run.append(value)
+		if len(run) >= run_size:
+			run_files.append(_flush_run(run, run_dir, len(run_files)))
+			run = []
+	if run:
+		run_files.append(_flush_run(run, run_dir, len(run_files)))
+	return run_files
+
+def _flush_run(run: list, run_dir: str, run_number: int):
+	run.sort()
+	path = os.path.join(run_dir, f"run_{run_number}.txt")
+	with open(path, 'w') as f:
+		f.writelines(f"{value}\n" for value in run)
+	return path
+
+def merge_runs(run_files: list, fan_in: int = 128):
+	"""
+	k-way merge of the sorted runs, yields values in ascending order. At most fan_in runs are open at once,
+	larger sets of runs are first merged in groups of fan_in into intermediate runs next to the originals.
+
+	:param run_files: Paths to the sorted run files
+	:param fan_in: Maximum number of runs merged (and files held open) at once, at least 2
+	:return: Generator over the merged values
+	"""
+	merge_pass = 0
+	while len(run_files) > fan_in:
+		merged_files = []
+		for group_start in range(0, len(run_files), fan_in):
+			group = run_files[group_start:group_start + fan_in]
+			path = os.path.join(os.path.dirname(group[0]), f"merge_{merge_pass}_{len(merged_files)}.txt")
+			with open(path, 'w') as f:
+				f.writelines(f"{value}\n" for value in _merge_open_runs(group))
+			for run_file in group:
+				os.remove(run_file)
+			merged_files.append(path)
+		run_files = merged_files
+		merge_pass += 1
+	yield from _merge_open_runs(run_files)
+
+def _merge_open_runs(run_files: list):
+	handles = []
+	try:
+		for path in run_files:
+			handles.append(open(path, 'r'))
+		yield from heapq.merge(*[map(int, handle) for handle in handles])
+	finally:
+		for handle in handles:
+			handle.close()
+
+def load_lists(file: str, use_numpy: bool = True):
+	"""
+	Lightweight replacement for read_lists that avoids pandas. The file is memory mapped and the two
+	whitespace separated columns are parsed straight into compact integer arrays.
+
+	:param file: Path to the input file
+	:param use_numpy: Return NumPy arrays when NumPy is available, otherwise array('q')
+	:return: The left and right columns
+	"""
+	list1 = array('q')
+	list2 = array('q')
+	with open(file, 'rb') as f:
+		if os.fstat(f.fileno()).st_size > 0:
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				# Read line by line from the mapping rather than copying the whole file into one bytes object
+				for line in iter(mm.readline, b""):
+					fields = line.split()
+					if not fields:
+						continue
+					if len(fields) != 2:
+						raise ValueError(f"Expected two columns in {file}, found {line!r}.")
+					list1.append(int(fields[0]))
+					list2.append(int(fields[1]))
+
+	np = _import_numpy() if use_numpy else None
+	if np is not None:
+		return np.frombuffer(list1, dtype=np.int64).copy(), np.frombuffer(list2, dtype=np.int64).copy()
+	return list1, list2
+
+def measure_startup(file: str = "Day1_input_lists.txt", budget: float = 0.5, runs: int = 5):
+	"""
+	Measures the cold start of the Day1 script, interpreter start up, import and main(), in a fresh interpreter.
+
+	:param file: Input file to load
+	:param budget: Startup budget in seconds
+	:param runs: Number of fresh interpreters to time, the best run is reported
+	:return: A tuple of (best_seconds, within_budget)
+	"""
+	import subprocess
+
+	module_dir = os.path.dirname(os.path.abspath(__file__))
+	code = f"import Day1; Day1.main({file!r})"
+	timings = []
+	for _ in range(runs):
+		start = time.perf_counter()
+		subprocess.run([sys.executable, "-c", code], cwd=module_dir, check=True, stdout=subprocess.DEVNULL)
+		timings.append(time.perf_counter() - start)
+
+	best = min(timings)
+	print(f"Day1 startup + main: {best:.3f}s (budget {budget:.3f}s)")
+	return best, best <= budget
+
+def streaming_list_distance(left_files, right_files=None, column_left: int = 0, column_right: int = 1,
+							run_size: int = 1_000_000):
+	"""
+	Out-of-core version of list_distance. Each side is external merge sorted into runs on disk and the
+	runs are merged pairwise, so memory stays bounded by run_size rather than the length of the lists.
+
+	:param left_files: Path or list of paths (shards) holding the left list
+	:param right_files: Path or list of paths holding the right list, defaults to the left files
+	:param column_left: Column of the left files to read
+	:param column_right: Column of the right files to read
+	:param run_size: Maximum number of values sorted in memory at once
+	:return: The total distance between the two lists
+	"""
+	if isinstance(left_files, str):
+		left_files = [left_files]
+	if right_files is None:
+		right_files = left_files
+	elif isinstance(right_files, str):
+		right_files = [right_files]
+
+	import tempfile
+
+	with tempfile.TemporaryDirectory() as left_dir, tempfile.TemporaryDirectory() as right_dir:
+		left_runs = write_sorted_runs(read_column(left_files, column_left), run_size, left_dir)
+		right_runs = write_sorted_runs(read_column(right_files, column_right), run_size, right_dir)
+
+		distance = 0
+		for left, right in zip_longest(merge_runs(left_runs), merge_runs(right_runs)):
+			if left is None or right is None:
+				raise ValueError("Left and right lists have different lengths.")
+			distance += abs(left - right)
+
+	return distance
+
+def similarity_score_histogram(list1, list2, dense_factor: int = 4):
+	"""
+	Same score as similarity_score, but built from a histogram of the right list so it runs in linear time.
+	When the ID range of the right list is dense (span no more than dense_factor times its length) the
+	histogram is a flat array indexed by ID, otherwise it is a hash count.
+
+	:param list1: Left list of location IDs
+	:param list2: Right list of location IDs
+	:param dense_factor: How sparse the right list may be before falling back to the hash count
+	:return: The similarity score
+	"""
+	if len(list1) == 0 or len(list2) == 0:
+		return 0
+
+	low, high = min(list2), max(list2)
+	span = high - low + 1
+	if span > dense_factor * len(list2):
+		return _similarity_score_hashed(list1, list2)
+	np = _import_numpy()
+	if np is not None:
+		return _similarity_score_bincount(np, list1, list2, low, span)
+	return _similarity_score_array(list1, list2, low, span)
+
+def _similarity_score_hashed(list1, list2):
+	counts = Counter(list2)
+	return sum(entry * counts[entry] for entry in list1 if entry in counts)
+
+def _similarity_score_array(list1, list2, low, span):
+	counts = [0] * span
+	for entry in list2:
+		counts[entry - low] += 1
+
+	score = 0
+	for entry in list1:
+		offset = entry - low
+		if 0 <= offset < span:
+			score += entry * counts[offset]
+	return score
+
+def _similarity_score_bincount(np, list1, list2, low, span):
+	left = np.asarray(list1, dtype=np.int64)
+	counts = np.bincount(np.asarray(list2, dtype=np.int64) - low, minlength=span)
+	offsets = left - low
+	in_range = (offsets >= 0) & (offsets < span)
+	return int(np.dot(left[in_range], counts[offsets[in_range]]))
+
+def benchmark_similarity(sizes=(10**4, 10**5, 10**6, 10**7), id_range=100_000, quadratic_limit=10**4, seed=2024):
+	"""
+	Times similarity_score_histogram against the original similarity_score on random lists. The original
+	is O(n^2), so it is only timed for sizes up to quadratic_limit.
+
+	:return: A list of (size, original_seconds or None, histogram_seconds) tuples
+	"""
+	import random
+
+	rng = random.Random(seed)
+	results = []
+	for size in sizes:
+		list1 = [rng.randrange(id_range) for _ in range(size)]
+		list2 = [rng.randrange(id_range) for _ in range(size)]
+
+		start = time.perf_counter()
+		fast_score = similarity_score_histogram(list1, list2)
+		fast_time = time.perf_counter() - start
+
+		slow_time = None
+		if size <= quadratic_limit:
+			start = time.perf_counter()
+			slow_score = similarity_score(list1, list2)
+			slow_time = time.perf_counter() - start
+			if slow_score != fast_score:
+				raise AssertionError(f"Score mismatch at size {size}: {slow_score} != {fast_score}")
+
+		results.append((size, slow_time, fast_time))
+		slow_text = f"{slow_time:.3f}s" if slow_time is not None else "skipped"
+		print(f"n={size:>9}: similarity_score {slow_text}, similarity_score_histogram {fast_time:.3f}s")
+	return results
+
+class ReconciliationIndex:
+	"""
+	Keeps list_distance and similarity_score of two ID lists up to date under inserts and removes.
+
+	The distance between two sorted lists of equal length equals the sum over every integer t of
+	|#left <= t - #right <= t|. That difference only changes at IDs that are present, so it is stored as one
+	slot per distinct ID, weighted by the gap to the next distinct ID, and an edit is a +1/-1 add over the
+	suffix of slots from its ID onwards. The slots live in a sorted-block list of roughly block_size slots
+	per block, each block with a lazy offset and the total weight of each stored value, giving
+	O(n / block_size + block_size) work per edit and memory proportional to the number of distinct IDs
+	rather than their span. The similarity score is kept exactly with one hash count per side in O(1).
+
+	Slots for IDs that drop out of both lists are kept, they cost nothing beyond their memory.
+	"""
+	def __init__(self, list1=(), list2=(), block_size: int = None):
+		self.counts = {"left": Counter(), "right": Counter()}
+		self.lengths = {"left": 0, "right": 0}
+		self.similarity = 0
+		for side, values in (("left", list1), ("right", list2)):
+			for value in values:
+				self._count(side, value, 1)
+
+		keys = sorted(self.counts["left"].keys() | self.counts["right"].keys())
+		self.block_size = block_size or max(32, int(len(keys) ** 0.5))
+
+		# Difference of the two cumulative counts at every distinct ID, and the gap to the next one
+		raw = []
+		running = 0
+		for key in keys:
+			running += self.counts["left"][key] - self.counts["right"][key]
+			raw.append(running)
+		weights = [following - key for key, following in zip(keys, keys[1:])] + [0] * bool(keys)
+
+		self.block_keys = []
+		self.block_raw = []
+		self.block_weights = []
+		self.block_lazy = []
+		self.block_counts = []
+		self.block_negative = []
+		self.block_abs = []
+		self.block_total = []
+		self.firsts = []
+		for start in range(0, len(keys), self.block_size):
+			end = start + self.block_size
+			self._add_block(len(self.block_keys), keys[start:end], raw[start:end], weights[start:end], 0)
+		self.total_abs = sum(self.block_abs)
+
+	def insert(self, side: str, value: int):
+		block, i = self._find(value)
+		if block is None or self.block_keys[block][i] != value:
+			block, i = self._add_slot(value, block, i)
+		self._count(side, value, 1)
+		self._suffix_add(block, i, 1 if side == "left" else -1)
+
+	def remove(self, side: str, value: int):
+		if self.counts[side][value] == 0:
+			raise ValueError(f"{value} is not in the {side} list.")
+		block, i = self._find(value)
+		self._count(side, value, -1)
+		self._suffix_add(block, i, -1 if side == "left" else 1)
+
+	def list_distance(self):
+		if self.lengths["left"] != self.lengths["right"]:
+			raise ValueError("Left and right lists have different lengths.")
+		return self.total_abs
+
+	def similarity_score(self):
+		return self.similarity
+
+	def _count(self, side: str, value: int, delta: int):
+		other = self.counts["right" if side == "left" else "left"]
+		self.similarity += delta * value * other[value]
+		self.counts[side][value] += delta
+		self.lengths[side] += delta
+
+	def _find(self, value: int):
+		# (block, index) of the last slot with an ID <= value, block is None when value precedes every slot
+		block = bisect_right(self.firsts, value) - 1
+		if block < 0:
+			return None, None
+		return block, bisect_right(self.block_keys[block], value) - 1
+
+	def _add_block(self, block: int, keys: list, raw: list, weights: list, lazy: int):
+		counts = Counter()
+		negative = 0
+		total_abs = 0
+		for value, weight in zip(raw, weights):
+			counts[value] += weight
+			negative += weight if value + lazy < 0 else 0
+			total_abs += weight * abs(value + lazy)
+		self.block_keys.insert(block, keys)
+		self.block_raw.insert(block, raw)
+		self.block_weights.insert(block, weights)
+		self.block_lazy.insert(block, lazy)
+		self.block_counts.insert(block, counts)
+		self.block_negative.insert(block, negative)
+		self.block_abs.insert(block, total_abs)
+		self.block_total.insert(block, sum(weights))
+		self.firsts.insert(block, keys[0])
+
+	def _add_slot(self, value: int, block, i):
+		"""
+		Adds a slot for a new distinct ID, splitting the gap of the slot before it.
+
+		:param value: The new ID
+		:param block: Block of the last slot before value, None if value precedes every slot
+		:param i: Index of that slot in its block
+		:return: The (block, index) of the new slot
+		"""
+		if not self.block_keys:
+			self._add_block(0, [value], [0], [0], 0)
+			return 0, 0
+		if block is None:
+			# Nothing is <= an ID below every slot, so its difference is zero
+			block, i, difference, weight = 0, 0, 0, self.block_keys[0][0] - value
+		else:
+			following = self._next_key(block, i)
+			difference = self.block_raw[block][i] + self.block_lazy[block]
+			weight = following - value if following is not None else 0
+			self._set_weight(block, i, value - self.block_keys[block][i])
+			i += 1
+
+		raw = difference - self.block_lazy[block]
+		self.block_keys[block].insert(i, value)
+		self.block_raw[block].insert(i, raw)
+		self.block_weights[block].insert(i, weight)
+		self.block_counts[block][raw] += weight
+		self.block_negative[block] += weight if difference < 0 else 0
+		self.block_abs[block] += weight * abs(difference)
+		self.block_total[block] += weight
+		self.total_abs += weight * abs(difference)
+		self.firsts[block] = self.block_keys[block][0]
+
+		if len(self.block_keys[block]) > 2 * self.block_size:
+			self._split_block(block)
+			if i >= self.block_size:
+				return block + 1, i - self.block_size
+		return block, i
+
+	def _next_key(self, block: int, i: int):
+		if i + 1 < len(self.block_keys[block]):
+			return self.block_keys[block][i + 1]
+		if block + 1 < len(self.block_keys):
+			return self.firsts[block + 1]
+		return None
+
+	def _split_block(self, block: int):
+		keys = self.block_keys[block]
+		raw = self.block_raw[block]
+		weights = self.block_weights[block]
+		lazy = self.block_lazy[block]
+		half = self.block_size
+		# The totals of both halves add up to the old block's, so total_abs is unchanged
+		for name in ("keys", "raw", "weights", "lazy", "counts", "negative", "abs", "total"):
+			del getattr(self, f"block_{name}")[block]
+		del self.firsts[block]
+		self._add_block(block, keys[:half], raw[:half], weights[:half], lazy)
+		self._add_block(block + 1, keys[half:], raw[half:], weights[half:], lazy)
+
+	def _set_weight(self, block: int, i: int, weight: int):
+		change = weight - self.block_weights[block][i]
+		self.block_weights[block][i] = weight
+		value = self.block_raw[block][i]
+		difference = value + self.block_lazy[block]
+		self.block_counts[block][value] += change
+		self.block_negative[block] += change if difference < 0 else 0
+		self.block_abs[block] += change * abs(difference)
+		self.block_total[block] += change
+		self.total_abs += change * abs(difference)
+
+	def _suffix_add(self, block: int, start: int, delta: int):
+		# Slots from start to the end of the block are shifted one by one, the blocks after it through their lazy
+		# offset. Every shift is by one, so a slot moves away from zero unless it starts on the other side of it.
+		raw = self.block_raw[block]
+		weights = self.block_weights[block]
+		counts = self.block_counts[block]
+		zero = -self.block_lazy[block]
+		moved = towards = crossing = 0
+		for i in range(start, len(raw)):
+			weight = weights[i]
+			old = raw[i]
+			new = old + delta
+			raw[i] = new
+			counts[old] -= weight
+			counts[new] += weight
+			moved += weight
+			if (old < zero) if delta > 0 else (old > zero):
+				towards += weight
+			if (new < zero) != (old < zero):
+				crossing += weight
+		change = moved - 2 * towards
+		self.block_abs[block] += change
+		self.block_negative[block] -= delta * crossing
+		self.total_abs += change
+
+		block_lazy = self.block_lazy
+		block_counts = self.block_counts
+		block_negative = self.block_negative
+		block_total = self.block_total
+		block_abs = self.block_abs
+		total_change = 0
+		for following in range(block + 1, len(block_lazy)):
+			lazy = block_lazy[following]
+			negative = block_negative[following]
+			if delta > 0:
+				change = block_total[following] - 2 * negative
+				block_negative[following] = negative - block_counts[following].get(-1 - lazy, 0)
+			else:
+				zeros = block_counts[following].get(-lazy, 0)
+				change = 2 * (negative + zeros) - block_total[following]
+				block_negative[following] = negative + zeros
+			block_lazy[following] = lazy + delta
+			block_abs[following] += change
+			total_change += change
+		self.total_abs += total_change
+
+def benchmark_reconciliation(size=10**5, edits=2000, id_range=10**6, check_every=100, seed=2024):
+	"""
+	Applies random inserts and removes to a ReconciliationIndex over two lists of size IDs, checking it
+	against a full list_distance and similarity_score recompute every check_every edits.
+
+	:return: A tuple of (seconds_per_edit, seconds_per_recompute)
+	"""
+	import random
+
+	rng = random.Random(seed)
+	list1 = [rng.randrange(id_range) for _ in range(size)]
+	list2 = [rng.randrange(id_range) for _ in range(size)]
+	index = ReconciliationIndex(list1, list2)
+
+	edit_time = 0.0
+	recompute_time = 0.0
+	checks = 0
+	for edit in range(1, edits + 1):
+		side, values = rng.choice((("left", list1), ("right", list2)))
+		position = rng.randrange(len(values))
+		removed = values[position]
+		# Occasionally reach well outside the initial range, like a corrected outlier ID
+		added = rng.randrange(id_range) if rng.random() < 0.99 else rng.randrange(-10**9, 10**9)
+		values[position] = added
+
+		start = time.perf_counter()
+		index.remove(side, removed)
+		index.insert(side, added)
+		edit_time += time.perf_counter() - start
+
+		if edit % check_every == 0:
+			start = time.perf_counter()
+			expected = list_distance(list1, list2)
+			recompute_time += time.perf_counter() - start
+			checks += 1
+			if index.list_distance() != expected:
+				raise AssertionError(f"Distance mismatch after {edit} edits: {index.list_distance()} != {expected}")
+			if index.similarity_score() != _similarity_score_hashed(list1, list2):
+				raise AssertionError(f"Similarity mismatch after {edit} edits")
+
+	per_edit = edit_time / (2 * edits)
+	per_recompute = recompute_time / max(checks, 1)
+	print(f"n={size}: {per_edit * 1e6:.1f}us per insert/remove, {per_recompute * 1e6:.1f}us per list_distance")
+	return per_edit, per_recompute
+
+def main(file: str = "Day1_input_lists.txt"):
+	list1, list2 = load_lists(file, use_numpy=False)
 	distance = list_distance(list1, list2)
 	print(f"The total distance between the left list and the right list is {distance}.")
 	sim_score = similarity_score(list1, list2)
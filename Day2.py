@@ -40,6 +40,82 @@ def is_report_safe(report):
 	else:
 		return False
 
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+def _require_numpy():
+	# Only the columnar batch functions use NumPy, the per-report checks and classify_reports don't
+	if np is None:
+		raise ImportError("The columnar report functions require NumPy.")
+
+def load_reports_columnar(file_path):
+	"""
+	Loads every report into a ragged columnar layout: one flat array of levels plus an offsets array,
+	where report i is values[offsets[i]:offsets[i + 1]].
+
+	:param file_path: Path to the reports file, one report per line
+	:return: A tuple of (values, offsets)
+	"""
+	_require_numpy()
+	values = []
+	offsets = [0]
+	with open(file_path, "r") as file:
+		for line in file:
+			# Blank lines stay in as empty reports so report i is always line i + 1
+			values.extend(map(int, line.split()))
+			offsets.append(len(values))
+	return np.asarray(values, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+def columnar_from_reports(reports):
+	_require_numpy()
+	values = [level for report in reports for level in report]
+	offsets = [0]
+	for report in reports:
+		offsets.append(offsets[-1] + len(report))
+	return np.asarray(values, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+def _padded_prefix_sum(flags, length):
+	# Prefix sum starting at 0, extended with its last value up to length elements
+	prefix = np.zeros(length, dtype=np.int64)
+	prefix[1:len(flags) + 1] = np.cumsum(flags)
+	prefix[len(flags) + 1:] = prefix[len(flags)]
+	return prefix
+
+def is_report_safe_batch(values, offsets):
+	"""
+	Vectorized is_report_safe over a whole columnar batch of reports.
+
+	:param values: Flat array of levels for every report
+	:param offsets: Array of report start offsets, with the total length appended
+	:return: A boolean mask with one entry per report
+	"""
+	_require_numpy()
+	if len(offsets) < 2:
+		return np.zeros(0, dtype=bool)
+
+	deltas = np.diff(values)
+	increasing_bad = (deltas < 1) | (deltas > 3)
+	decreasing_bad = (deltas < -3) | (deltas > -1)
+
+	# Report i owns deltas offsets[i] .. offsets[i + 1] - 2, so count bad deltas with a prefix sum.
+	# The delta straddling two reports sits at offsets[i + 1] - 1 and is never counted.
+	# The prefix arrays get one element per level plus one, so an empty report at the very end
+	# (start == end == len(values)) still indexes inside them.
+	starts = offsets[:-1]
+	ends = np.maximum(offsets[1:] - 1, starts)
+	increasing_prefix = _padded_prefix_sum(increasing_bad, len(values) + 1)
+	decreasing_prefix = _padded_prefix_sum(decreasing_bad, len(values) + 1)
+	increasing_ok = increasing_prefix[ends] == increasing_prefix[starts]
+	decreasing_ok = decreasing_prefix[ends] == decreasing_prefix[starts]
+	return increasing_ok | decreasing_ok
+
 test_array = [
 	[7, 6, 4, 2, 1],
 	[1, 2, 7, 8, 9],
@@ -48,31 +124,6 @@ test_array = [
 	[8, 6, 4, 4, 1],
 	[1, 3, 6, 7, 9]
 ]
-for report in test_array:
-	print(is_report_safe(report))
-
-
-
-file_path = "Day2_input.txt"
-safe_reports = []
-unsafe_reports = []
-
-with open(file_path, "r") as file:
-	for line_number, line in enumerate(file, start=1):
-		report = list(map(int, line.split()))
-		if is_report_safe(report):
-			safe_reports.append((line_number, report))
-		else:
-			unsafe_reports.append((line_number, report))
-
-# Output the results
-print(f"Total Reports: {line_number}")
-print(f"Safe Reports: {len(safe_reports)}")
-print(f"Unsafe Reports: {len(unsafe_reports)}")
-
-print(f"\nSafe Reports (Line Numbers): {[r[0] for r in safe_reports]}")
-print(f"Unsafe Reports (Line Numbers): {[r[0] for r in unsafe_reports]}")
-
 # --- Part Two ---
 # The engineers are surprised by the low number of safe reports until they realize they forgot to tell you about the Problem Dampener.
 #
@@ -93,34 +144,204 @@ print(f"Unsafe Reports (Line Numbers): {[r[0] for r in unsafe_reports]}")
 # Update your analysis by handling situations where the Problem Dampener can remove a single level from unsafe reports. How many reports are now safe?
 
 def is_report_safe_with_dampener(report):
-	if is_report_safe(report):
-		return True
+	return dampener_removal(report)[0]
+
+def dampener_removal(report):
+	"""
+	Single pass Problem Dampener check. For each direction the first bad delta is found, and only the two
+	levels on either side of it are candidates for removal, each checked in place without copying the report.
+
+	:param report: List of levels
+	:return: A tuple of (is_safe, removed_index), removed_index is None when no level had to be removed
+	"""
+	candidates = []
+	for direction in (1, -1):
+		bad_index = _first_bad_delta(report, direction)
+		if bad_index is None:
+			return True, None
+		for skip in (bad_index, bad_index + 1):
+			if _is_safe_skipping(report, skip, direction):
+				candidates.append(skip)
+				break
+
+	if candidates:
+		return True, min(candidates)
+	return False, None
 
-	# Try removing each level and check if the resulting report is safe
-	for i in range(len(report)):
-		modified_report = report[:i] + report[i + 1:]  # Remove level at index i
-		if is_report_safe(modified_report):
-			print(f"Report {report} becomes safe by removing level at index {i}: {report[i]}")
-			return True
+def _first_bad_delta(report, direction):
+	for i in range(len(report) - 1):
+		if not 1 <= (report[i + 1] - report[i]) * direction <= 3:
+			return i
+	return None
 
-	# If no single removal makes it safe, return False
-	return False
+def _is_safe_skipping(report, skip, direction):
+	previous = None
+	for i, level in enumerate(report):
+		if i == skip:
+			continue
+		if previous is not None and not 1 <= (level - previous) * direction <= 3:
+			return False
+		previous = level
+	return True
 
-file_path = "Day2_input.txt"
-safe_reports_with_dampener = []
-unsafe_reports_with_dampener = []
+def min_removals_for_direction(report, direction, k):
+	"""
+	Minimum number of levels to remove so the report is safe in one direction, or None if more than k.
+	best[j] is the fewest removals before index j when level j is kept. Since at most k levels can be
+	removed, the previous kept level is one of the k + 1 levels before j, so the DP is O(n * k).
 
-with open(file_path, "r") as file:
-	for line_number, line in enumerate(file, start=1):
+	:param report: List of levels
+	:param direction: 1 for increasing, -1 for decreasing
+	:param k: Maximum number of removals allowed
+	:return: The minimum number of removals, or None if the report needs more than k
+	"""
+	n = len(report)
+	if n == 0:
+		return 0
+
+	best = [0] * n
+	answer = None
+	for j in range(n):
+		# Dropping everything before j
+		fewest = j
+		for i in range(max(0, j - k - 1), j):
+			if best[i] is not None and 1 <= (report[j] - report[i]) * direction <= 3:
+				removals = best[i] + (j - i - 1)
+				if removals < fewest:
+					fewest = removals
+		best[j] = fewest if fewest <= k else None
+
+		if best[j] is not None:
+			total = best[j] + (n - 1 - j)
+			if total <= k and (answer is None or total < answer):
+				answer = total
+	return answer
+
+def is_report_safe_with_tolerance(report, k=1):
+	return any(min_removals_for_direction(report, direction, k) is not None for direction in (1, -1))
+
+def is_report_safe_with_tolerance_batch(reports, k=1):
+	return [is_report_safe_with_tolerance(report, k) for report in reports]
+
+def benchmark_tolerance(reports, tolerances=range(1, 6)):
+	"""
+	Times the k-tolerant check over a batch of reports for each k.
+
+	:return: A list of (k, safe_count, seconds) tuples
+	"""
+	results = []
+	for k in tolerances:
+		start = time.perf_counter()
+		safe_count = sum(is_report_safe_with_tolerance_batch(reports, k))
+		elapsed = time.perf_counter() - start
+		results.append((k, safe_count, elapsed))
+		print(f"k={k}: {safe_count} safe reports in {elapsed:.3f}s")
+	return results
+
+def read_report_chunks(file_path, chunk_size):
+	# Stream the file as lists of at most chunk_size lines
+	chunk = []
+	with open(file_path, "r") as file:
+		for line in file:
+			chunk.append(line)
+			if len(chunk) == chunk_size:
+				yield chunk
+				chunk = []
+	if chunk:
+		yield chunk
+
+def classify_chunk(lines):
+	"""
+	Runs both the plain and the dampened check over a chunk of report lines.
+
+	:param lines: List of report lines
+	:return: A tuple of (report_count, safe_bitmap, dampened_safe_bitmap), bit i is report i of the chunk
+	"""
+	safe_bitmap = bytearray((len(lines) + 7) // 8)
+	dampened_bitmap = bytearray((len(lines) + 7) // 8)
+	for i, line in enumerate(lines):
 		report = list(map(int, line.split()))
-		if is_report_safe_with_dampener(report):
-			safe_reports_with_dampener.append((line_number, report))
-		else:
-			unsafe_reports_with_dampener.append((line_number, report))
+		if is_report_safe(report):
+			safe_bitmap[i >> 3] |= 1 << (i & 7)
+			dampened_bitmap[i >> 3] |= 1 << (i & 7)
+		elif is_report_safe_with_dampener(report):
+			dampened_bitmap[i >> 3] |= 1 << (i & 7)
+	return len(lines), safe_bitmap, dampened_bitmap
+
+def classify_reports(file_path, chunk_size=8192, workers=None):
+	"""
+	Streams the reports file in chunks and classifies them across a process pool in a single pass. Only
+	counts and one bit per report are kept, so memory does not grow with the size of the reports.
+
+	:param file_path: Path to the reports file
+	:param chunk_size: Lines per chunk, rounded up to a multiple of 8 so chunk bitmaps concatenate
+	:param workers: Number of worker processes, 1 classifies in this process
+	:return: A tuple of (total_reports, safe_bitmap, dampened_safe_bitmap), bit i is line number i + 1
+	"""
+	chunk_size = (chunk_size + 7) // 8 * 8
+	chunks = read_report_chunks(file_path, chunk_size)
+	total = 0
+	safe_bitmap = bytearray()
+	dampened_bitmap = bytearray()
+
+	if workers == 1:
+		results = map(classify_chunk, chunks)
+	else:
+		workers = workers or os.cpu_count() or 1
+		executor = ProcessPoolExecutor(max_workers=workers)
+		results = _bounded_map(executor, classify_chunk, chunks, workers * 2)
+
+	try:
+		for count, chunk_safe, chunk_dampened in results:
+			total += count
+			safe_bitmap += chunk_safe
+			dampened_bitmap += chunk_dampened
+	finally:
+		if workers != 1:
+			executor.shutdown()
+
+	return total, safe_bitmap, dampened_bitmap
+
+def _bounded_map(executor, function, items, max_pending):
+	# Like executor.map, but only keeps max_pending chunks in flight instead of consuming the whole stream
+	pending = deque()
+	for item in items:
+		pending.append(executor.submit(function, item))
+		if len(pending) >= max_pending:
+			yield pending.popleft().result()
+	while pending:
+		yield pending.popleft().result()
+
+def bitmap_count(bitmap):
+	return int.from_bytes(bitmap, "little").bit_count()
+
+def bitmap_line_numbers(bitmap, total, value=True):
+	# Line numbers (starting at 1) whose bit is set, or clear when value is False
+	for i in range(total):
+		if bool(bitmap[i >> 3] & (1 << (i & 7))) == value:
+			yield i + 1
+
+def main():
+	for report in test_array:
+		print(is_report_safe(report))
+
+	total, safe_bitmap, dampened_bitmap = classify_reports("Day2_input.txt")
+	safe_count = bitmap_count(safe_bitmap)
+	dampened_count = bitmap_count(dampened_bitmap)
+
+	print(f"Total Reports: {total}")
+	print(f"Safe Reports: {safe_count}")
+	print(f"Unsafe Reports: {total - safe_count}")
+
+	print(f"\nSafe Reports (Line Numbers): {list(bitmap_line_numbers(safe_bitmap, total))}")
+	print(f"Unsafe Reports (Line Numbers): {list(bitmap_line_numbers(safe_bitmap, total, False))}")
+
+	print(f"Total Reports: {total}")
+	print(f"Safe Reports with dampener: {dampened_count}")
+	print(f"Unsafe Reports with dampener: {total - dampened_count}")
 
-print(f"Total Reports: {line_number}")
-print(f"Safe Reports with dampener: {len(safe_reports_with_dampener)}")
-print(f"Unsafe Reports with dampener: {len(unsafe_reports_with_dampener)}")
+	print(f"\nSafe Reports with dampener (Line Numbers): {list(bitmap_line_numbers(dampened_bitmap, total))}")
+	print(f"Unsafe Reports with dampener (Line Numbers): {list(bitmap_line_numbers(dampened_bitmap, total, False))}")
 
-print(f"\nSafe Reports with dampener (Line Numbers): {[r[0] for r in safe_reports_with_dampener]}")
-print(f"Unsafe Reports with dampener (Line Numbers): {[r[0] for r in unsafe_reports_with_dampener]}")
+if __name__ == "__main__":
+	main()
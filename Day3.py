@@ -17,7 +17,13 @@
 # Scan the corrupted memory for uncorrupted mul instructions. What do you get if you add up all of the results of the multiplications?
 
 # Goal of this is to parse and clean some text strings to extract numerical instructions, regex will be our friend
+import json
+import mmap
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 test_string = "xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
 
@@ -27,14 +33,7 @@ def uncorrupt_string(string: str):
 	result = sum([(int(x) * int(y)) for x, y in matches])
 	return result
 
-print(uncorrupt_string(test_string))
-
 file = 'Day3_input.txt'
-with open(file, 'r') as f:
-	data = f.read()
-
-result = uncorrupt_string(data)
-print(result)
 
 # --- Part Two ---
 # As you scan through the corrupted memory, you notice that some of the conditional statements are also still intact. If you handle some of the uncorrupted conditional statements in the program, you might be able to get an even more accurate result.
@@ -90,6 +89,255 @@ def uncorrupt_string_instructions(string: str):
 	return do_sum
 
 
-print(uncorrupt_string_instructions(test_string_2))
-part2_result = uncorrupt_string_instructions(data)
-print(part2_result)
\ No newline at end of file
+# do(), don't() and mul(X,Y) in one pattern, so the memory is only scanned once
+INSTRUCTION_PATTERN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+# Longest possible instruction is mul(999,999)
+MAX_INSTRUCTION_LENGTH = 12
+
+def iter_instructions(stream, chunk_size=1 << 20):
+	"""
+	Single pass scanner over a binary stream read in fixed size chunks. Instructions that straddle a chunk
+	boundary are carried over into the next chunk, so memory stays at roughly chunk_size.
+
+	:param stream: Binary file-like object
+	:param chunk_size: Number of bytes read at a time
+	:return: Generator of (x, y) tuples for mul instructions, True for do() and False for don't()
+	"""
+	carry = b""
+	while True:
+		chunk = stream.read(chunk_size)
+		buffer = carry + chunk
+		final = not chunk
+		# Any match starting before this point is guaranteed to be complete within the buffer
+		boundary = len(buffer) if final else max(len(buffer) - MAX_INSTRUCTION_LENGTH + 1, 0)
+		last_end = 0
+
+		for match in INSTRUCTION_PATTERN.finditer(buffer):
+			if match.start() >= boundary:
+				break
+			last_end = match.end()
+			if match.group(1) is not None:
+				yield int(match.group(1)), int(match.group(2))
+			else:
+				yield match.group(0) == b"do()"
+
+		if final:
+			return
+		carry = buffer[max(boundary, last_end):]
+
+def scan_enabled_sum(file_path, chunk_size=1 << 20):
+	enabled = True
+	do_sum = 0
+	with open(file_path, 'rb') as f:
+		for instruction in iter_instructions(f, chunk_size):
+			if isinstance(instruction, bool):
+				enabled = instruction
+			elif enabled:
+				do_sum += instruction[0] * instruction[1]
+	return do_sum
+
+def scan_range(file_path, start, end):
+	"""
+	Scans the instructions starting in the byte range [start, end) of a file. The range is read with an
+	overlap of MAX_INSTRUCTION_LENGTH - 1 bytes so an instruction straddling end is still seen whole.
+	No instruction can occur inside another one, so matches found from start are the same as in a serial scan.
+
+	:return: A summary tuple of (total_sum, sum_if_enabled, sum_if_disabled, last_toggle), where the two
+		conditional sums assume the range starts enabled or disabled and last_toggle is the last do()/don't()
+		seen as True/False, or None if the range has neither
+	"""
+	total_sum = 0
+	sum_if_enabled = 0
+	sum_if_disabled = 0
+	last_toggle = None
+	# Before the first do()/don't() the enabled state is whatever it was coming into the range
+	state = None
+
+	with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+		window = mm[start:min(end + MAX_INSTRUCTION_LENGTH - 1, len(mm))]
+
+	for match in INSTRUCTION_PATTERN.finditer(window):
+		if match.start() >= end - start:
+			break
+		if match.group(1) is None:
+			state = last_toggle = match.group(0) == b"do()"
+			continue
+		product = int(match.group(1)) * int(match.group(2))
+		total_sum += product
+		if state is None:
+			sum_if_enabled += product
+		elif state:
+			sum_if_enabled += product
+			sum_if_disabled += product
+
+	return total_sum, sum_if_enabled, sum_if_disabled, last_toggle
+
+def merge_summaries(summaries):
+	# Reduce the range summaries in file order into (total_sum, enabled_sum)
+	total_sum = 0
+	enabled_sum = 0
+	enabled = True
+	for range_total, sum_if_enabled, sum_if_disabled, last_toggle in summaries:
+		total_sum += range_total
+		enabled_sum += sum_if_enabled if enabled else sum_if_disabled
+		if last_toggle is not None:
+			enabled = last_toggle
+	return total_sum, enabled_sum
+
+def parallel_scan(file_path, workers=None, range_size=64 << 20):
+	"""
+	Splits a memory dump into byte ranges, scans them in a process pool and merges the summaries in order.
+
+	:param file_path: Path to the memory dump
+	:param workers: Number of worker processes
+	:param range_size: Bytes per range
+	:return: A tuple of (total_sum, enabled_sum), the answers to uncorrupt_string and uncorrupt_string_instructions
+	"""
+	size = os.path.getsize(file_path)
+	starts = range(0, size, range_size)
+	ends = [min(start + range_size, size) for start in starts]
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		summaries = executor.map(scan_range, repeat(file_path), starts, ends)
+		return merge_summaries(summaries)
+
+def _apply_instructions(buffer, boundary, enabled, total_sum, enabled_sum):
+	# Apply every instruction starting before boundary, returning the new state and where the last one ended
+	last_end = 0
+	for match in INSTRUCTION_PATTERN.finditer(buffer):
+		if match.start() >= boundary:
+			break
+		last_end = match.end()
+		if match.group(1) is None:
+			enabled = match.group(0) == b"do()"
+			continue
+		product = int(match.group(1)) * int(match.group(2))
+		total_sum += product
+		if enabled:
+			enabled_sum += product
+	return enabled, total_sum, enabled_sum, last_end
+
+def follow_scan(file_path, state_path, chunk_size=1 << 20):
+	"""
+	Tail mode for an append-only memory dump. The scanner state (byte offset, enabled flag, running sums and
+	the unmatched bytes at the end that may still become an instruction) is saved to state_path, so each
+	run only reads the bytes appended since the last one. If the file has shrunk the scan starts over.
+
+	:param file_path: Path to the memory dump
+	:param state_path: Path to the JSON state file, created if missing
+	:param chunk_size: Number of bytes read at a time
+	:return: A tuple of (total_sum, enabled_sum), identical to a full rescan of the file
+	"""
+	state = {"offset": 0, "enabled": True, "total_sum": 0, "enabled_sum": 0, "carry": ""}
+	if os.path.exists(state_path):
+		with open(state_path, 'r') as f:
+			state = json.load(f)
+		if os.path.getsize(file_path) < state["offset"]:
+			state = {"offset": 0, "enabled": True, "total_sum": 0, "enabled_sum": 0, "carry": ""}
+
+	enabled = state["enabled"]
+	total_sum = state["total_sum"]
+	enabled_sum = state["enabled_sum"]
+	carry = state["carry"].encode("latin-1")
+	offset = state["offset"]
+
+	with open(file_path, 'rb') as f:
+		f.seek(offset)
+		while True:
+			chunk = f.read(chunk_size)
+			if not chunk:
+				break
+			offset += len(chunk)
+			buffer = carry + chunk
+			boundary = max(len(buffer) - MAX_INSTRUCTION_LENGTH + 1, 0)
+			enabled, total_sum, enabled_sum, last_end = _apply_instructions(
+				buffer, boundary, enabled, total_sum, enabled_sum)
+			carry = buffer[max(boundary, last_end):]
+
+	state = {
+		"offset": offset,
+		"enabled": enabled,
+		"total_sum": total_sum,
+		"enabled_sum": enabled_sum,
+		"carry": carry.decode("latin-1"),
+	}
+	with open(state_path, 'w') as f:
+		json.dump(state, f)
+
+	# The carried bytes may already hold a complete instruction, count it without committing it to the state
+	_, total_sum, enabled_sum, _ = _apply_instructions(carry, len(carry), enabled, total_sum, enabled_sum)
+	return total_sum, enabled_sum
+
+def scan_with_stats(file_path):
+	"""
+	Scans a memory dump in bytes mode directly over an mmap with the precompiled INSTRUCTION_PATTERN, without
+	decoding the file or building a list of matches.
+
+	:param file_path: Path to the memory dump
+	:return: A dict with the sums, per-instruction counts, bytes scanned, elapsed seconds and MB/s
+	"""
+	stats = {
+		"total_sum": 0,
+		"enabled_sum": 0,
+		"mul": 0,
+		"enabled_mul": 0,
+		"do": 0,
+		"dont": 0,
+		"bytes": os.path.getsize(file_path),
+		"seconds": 0.0,
+		"mb_per_s": 0.0,
+	}
+	if stats["bytes"] == 0:
+		return stats
+
+	start = time.perf_counter()
+	total_sum = enabled_sum = 0
+	mul_count = enabled_mul_count = do_count = dont_count = 0
+	enabled = True
+	with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+		for match in INSTRUCTION_PATTERN.finditer(mm):
+			x = match.group(1)
+			if x is None:
+				enabled = match.group(0) == b"do()"
+				if enabled:
+					do_count += 1
+				else:
+					dont_count += 1
+				continue
+			product = int(x) * int(match.group(2))
+			total_sum += product
+			mul_count += 1
+			if enabled:
+				enabled_sum += product
+				enabled_mul_count += 1
+	elapsed = time.perf_counter() - start
+
+	stats.update({
+		"total_sum": total_sum,
+		"enabled_sum": enabled_sum,
+		"mul": mul_count,
+		"enabled_mul": enabled_mul_count,
+		"do": do_count,
+		"dont": dont_count,
+		"seconds": elapsed,
+		"mb_per_s": stats["bytes"] / (1 << 20) / elapsed if elapsed > 0 else float("inf"),
+	})
+	return stats
+
+def main():
+	print(uncorrupt_string(test_string))
+
+	with open(file, 'r') as f:
+		data = f.read()
+
+	result = uncorrupt_string(data)
+	print(result)
+
+	print(uncorrupt_string_instructions(test_string_2))
+	part2_result = uncorrupt_string_instructions(data)
+	print(part2_result)
+	print(scan_enabled_sum(file))
+	print(parallel_scan(file))
+	print(scan_with_stats(file))
+
+if __name__ == "__main__":
+	main()
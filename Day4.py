@@ -37,11 +37,6 @@
 # .X.X.XMASX
 # Take a look at the little Elf's word search. How many times does XMAS appear?
 
-input = ('Day4_input.txt')
-
-with open(input, 'r') as f:
-	data = f.read()
-
 
 def get_neighbours(matrix, row, col):
 	"""Fetches all valid neighbors of a given element in the matrix."""
@@ -153,16 +148,223 @@ def check_string_in_rows(matrix, search_string):
 
 	return string_count
 
-result = check_string_in_rows(input_matrix, "XMAS")
-print(result)
-
 file_path = 'Day4_input.txt'
 
-with open(file_path, 'r') as f:
-	matrix = [list(line.strip()) for line in f.readlines()]
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Grid import DIRECTIONS, Grid
 
-answer = check_string_in_rows(matrix, "XMAS")
-print(answer)
+
+def load_grid(file_path):
+	"""
+	Loads a word search file into a 2D uint8 array of character codes.
+
+	:param file_path: Path to the word search, one row per line
+	:return: A (rows, cols) uint8 NumPy array, a read-only view over the shared Grid buffer
+	"""
+	return Grid.from_file(file_path).as_array()
+
+
+def grid_from_matrix(matrix):
+	return np.array([[ord(char) for char in row] for row in matrix], dtype=np.uint8)
+
+
+def count_word(grid, word, own_rows=None):
+	"""
+	Counts a word in all 8 directions of a uint8 grid using shifted slice equality masks, the vectorized
+	equivalent of check_string_in_rows.
+
+	:param grid: 2D uint8 array of character codes
+	:param word: Word to search for
+	:param own_rows: Only count occurrences whose topmost row is before this row, used for banded searches
+	:return: Number of occurrences of the word
+	"""
+	rows, cols = grid.shape
+	codes = word.encode()
+	length = len(codes)
+	count = 0
+
+	for dr, dc in DIRECTIONS:
+		# Range of starting cells whose whole word stays within the grid
+		row_start = (length - 1) if dr < 0 else 0
+		row_stop = rows - (length - 1) if dr > 0 else rows
+		col_start = (length - 1) if dc < 0 else 0
+		col_stop = cols - (length - 1) if dc > 0 else cols
+		if own_rows is not None:
+			# Words going up have their topmost row length - 1 rows above the start
+			row_stop = min(row_stop, own_rows + (length - 1 if dr < 0 else 0))
+		if row_start >= row_stop or col_start >= col_stop:
+			continue
+
+		mask = grid[row_start:row_stop, col_start:col_stop] == codes[0]
+		for k in range(1, length):
+			r, c = row_start + k * dr, col_start + k * dc
+			mask &= grid[r:r + row_stop - row_start, c:c + col_stop - col_start] == codes[k]
+		count += int(np.count_nonzero(mask))
+
+	return count
+
+
+def iter_bands(file_path, band_rows, halo):
+	"""
+	Streams a word search file as bands of band_rows rows, each followed by a halo of the next halo rows.
+
+	:return: Generator of (lines, own_rows) tuples, where only the first own_rows lines belong to the band
+	"""
+	band = []
+	with open(file_path, 'rb') as f:
+		for line in f:
+			line = line.strip()
+			if not line:
+				continue
+			band.append(line)
+			if len(band) == band_rows + halo:
+				yield band, band_rows
+				band = band[band_rows:]
+	if band:
+		yield band, len(band)
+
+
+def count_word_in_band(lines, own_rows, word):
+	grid = np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), -1)
+	return count_word(grid, word, own_rows)
+
+
+def count_word_tiled(file_path, word, band_rows=4096, workers=None):
+	"""
+	Counts a word in a word search too large to load at once. The grid is streamed in row bands with a halo
+	of len(word) - 1 rows, and each band only counts the occurrences whose topmost row it owns, so words
+	crossing a band boundary are counted exactly once. Peak memory is proportional to the band size.
+
+	:param file_path: Path to the word search
+	:param word: Word to search for
+	:param band_rows: Rows owned by each band
+	:param workers: Number of worker processes, 1 counts the bands in this process
+	:return: Number of occurrences of the word
+	"""
+	bands = iter_bands(file_path, band_rows, len(word) - 1)
+	if workers == 1:
+		return sum(count_word_in_band(lines, own_rows, word) for lines, own_rows in bands)
+
+	workers = workers or os.cpu_count() or 1
+	total = 0
+	pending = deque()
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		# Only keep a couple of bands per worker in flight so the file is not read ahead into memory
+		for lines, own_rows in bands:
+			pending.append(executor.submit(count_word_in_band, lines, own_rows, word))
+			if len(pending) >= workers * 2:
+				total += pending.popleft().result()
+		while pending:
+			total += pending.popleft().result()
+	return total
+
+
+class AhoCorasick:
+	"""
+	Aho-Corasick automaton over a list of words, built once and reused to count every word in a single
+	pass over each line of text.
+	"""
+	def __init__(self, words):
+		self.words = list(words)
+		self.goto = [{}]
+		self.fail = [0]
+		self.output = [[]]
+
+		# Build the trie
+		for index, word in enumerate(self.words):
+			state = 0
+			for char in word:
+				if char not in self.goto[state]:
+					self.goto.append({})
+					self.fail.append(0)
+					self.output.append([])
+					self.goto[state][char] = len(self.goto) - 1
+				state = self.goto[state][char]
+			self.output[state].append(index)
+
+		# Breadth first pass to set the failure links and merge outputs along them
+		queue = deque(self.goto[0].values())
+		while queue:
+			state = queue.popleft()
+			for char, next_state in self.goto[state].items():
+				queue.append(next_state)
+				fallback = self.fail[state]
+				while fallback and char not in self.goto[fallback]:
+					fallback = self.fail[fallback]
+				self.fail[next_state] = self.goto[fallback].get(char, 0)
+				self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+	def count(self, text, counts):
+		# Adds the occurrences of every word in text to counts, a list indexed like self.words
+		goto, fail, output = self.goto, self.fail, self.output
+		state = 0
+		for char in text:
+			while state and char not in goto[state]:
+				state = fail[state]
+			state = goto[state].get(char, 0)
+			for index in output[state]:
+				counts[index] += 1
+
+
+def iter_lines(matrix):
+	# Every row, column and diagonal of the matrix as a string, in both directions
+	if isinstance(matrix, Grid):
+		yield from iter_grid_lines(matrix)
+		return
+	for row in matrix:
+		line = "".join(row)
+		yield line
+		yield line[::-1]
+	for row in zip(*matrix):
+		line = "".join(row)
+		yield line
+		yield line[::-1]
+	for diagonal in extract_diagonals(matrix):
+		yield diagonal
+		yield diagonal[::-1]
+
+
+def iter_grid_lines(grid):
+	# Same lines as iter_lines, cut as strided slices of the Grid buffer instead of from per-cell strings
+	data, rows, cols, stride = grid.data, grid.rows, grid.cols, grid.stride
+	starts = []
+	for row in range(rows):
+		starts.append((grid.index(row, 0), 1, cols))
+	for col in range(cols):
+		starts.append((grid.index(0, col), stride, rows))
+	for col in range(cols):
+		starts.append((grid.index(0, col), stride + 1, min(rows, cols - col)))
+		starts.append((grid.index(0, col), stride - 1, min(rows, col + 1)))
+	for row in range(1, rows):
+		starts.append((grid.index(row, 0), stride + 1, min(rows - row, cols)))
+		starts.append((grid.index(row, cols - 1), stride - 1, min(rows - row, cols)))
+
+	for start, step, length in starts:
+		line = data[start:start + step * (length - 1) + 1:step].decode()
+		yield line
+		yield line[::-1]
+
+
+def count_words(matrix, words, automaton=None):
+	"""
+	Counts many words at once by streaming every line in all 8 directions through one Aho-Corasick automaton.
+
+	:param matrix: Grid or List of Lists representing the word search
+	:param words: List of words to search for
+	:param automaton: Optional prebuilt AhoCorasick for the same words
+	:return: A dict mapping each word to its number of occurrences
+	"""
+	if automaton is None:
+		automaton = AhoCorasick(words)
+	counts = [0] * len(automaton.words)
+	for line in iter_lines(matrix):
+		automaton.count(line, counts)
+	return dict(zip(automaton.words, counts))
 
 # --- Part Two ---
 # The Elf looks quizzically at you. Did you misunderstand the assignment?
@@ -235,8 +437,166 @@ def count_a_with_diagonal_neighbours(matrix):
 
 	return count
 
-result = count_a_with_diagonal_neighbours(test_matrix)
-print(result)
 
-answer2 = count_a_with_diagonal_neighbours(matrix)
-print(answer2)
\ No newline at end of file
+
+def count_x_mas(grid):
+	"""
+	count_a_with_diagonal_neighbours over a compact Grid, using flat indices and the sentinel border
+	instead of per-cell neighbour lists and bounds checks.
+
+	:param grid: Grid holding the word search
+	:return: Number of X-MAS occurrences
+	"""
+	data = grid.data
+	top_left, top_right = grid.offsets[(-1, -1)], grid.offsets[(-1, 1)]
+	bottom_left, bottom_right = grid.offsets[(1, -1)], grid.offsets[(1, 1)]
+	m, s = ord('M'), ord('S')
+	count = 0
+	for index in grid.find_all('A'):
+		first = data[index + top_left], data[index + bottom_right]
+		second = data[index + top_right], data[index + bottom_left]
+		if first in ((m, s), (s, m)) and second in ((m, s), (s, m)):
+			count += 1
+	return count
+
+
+X_MAS_TEMPLATE = [
+	"M.S",
+	".A.",
+	"M.S"
+]
+
+
+def template_variants(template, rotations=True, reflections=True):
+	"""
+	Generates the distinct rotations and reflections of a 2D template.
+
+	:param template: List of equal length strings
+	:param rotations: Include the 90, 180 and 270 degree rotations
+	:param reflections: Include the mirror images
+	:return: A list of distinct templates, each a tuple of strings
+	"""
+	variants = []
+	seen = set()
+	base = [tuple(template)]
+	if reflections:
+		base.append(tuple(row[::-1] for row in template))
+
+	for variant in base:
+		for _ in range(4 if rotations else 1):
+			if variant not in seen:
+				seen.add(variant)
+				variants.append(variant)
+			# Rotate 90 degrees clockwise
+			variant = tuple("".join(column) for column in zip(*reversed(variant)))
+	return variants
+
+
+def count_template(grid, template, wildcard='.', rotations=True, reflections=True):
+	"""
+	Counts every placement of a small 2D template in a uint8 grid, across its rotations and reflections.
+	Each fixed template cell becomes one shifted slice equality mask, so no per-cell Python loop is needed.
+
+	:param grid: 2D uint8 array of character codes
+	:param template: List of equal length strings, wildcard cells match anything
+	:param wildcard: Character treated as a wildcard in the template
+	:return: Number of occurrences of the template and its variants
+	"""
+	rows, cols = grid.shape
+	count = 0
+	for variant in template_variants(template, rotations, reflections):
+		height, width = len(variant), len(variant[0])
+		if height > rows or width > cols:
+			continue
+		out_rows, out_cols = rows - height + 1, cols - width + 1
+
+		mask = np.ones((out_rows, out_cols), dtype=bool)
+		for i, row in enumerate(variant):
+			for j, char in enumerate(row):
+				if char != wildcard:
+					mask &= grid[i:i + out_rows, j:j + out_cols] == ord(char)
+		count += int(np.count_nonzero(mask))
+	return count
+
+
+class IncrementalWordSearch:
+	"""
+	Keeps the XMAS and X-MAS counts of a word search up to date as single cells are edited. An edit only
+	re-examines the word windows passing through the cell, O(len(word) * 8), and the X-MAS centres touching it.
+	"""
+	def __init__(self, grid, word="XMAS"):
+		if not isinstance(grid, Grid):
+			grid = Grid.from_lines(["".join(row) for row in grid])
+		# Edits go to a copy-on-write clone, so the caller's grid (or a read-only view of it) is never changed
+		grid = grid.clone()
+		self.grid = grid
+		self.rows = grid.rows
+		self.cols = grid.cols
+		self.word = word
+		self.codes = word.encode()
+		self.word_count = count_word(grid.as_array(), word)
+		self.x_mas_count = count_x_mas(grid)
+
+	def set_cell(self, row, col, char):
+		if not (0 <= row < self.rows and 0 <= col < self.cols):
+			raise IndexError("Position out of map bounds!")
+		index = self.grid.index(row, col)
+		if self.grid.data[index] == ord(char):
+			return
+		self.word_count -= self._word_windows_through(row, col)
+		self.x_mas_count -= self._x_mas_centres_around(index)
+		self.grid.set(index, ord(char))
+		self.word_count += self._word_windows_through(row, col)
+		self.x_mas_count += self._x_mas_centres_around(index)
+
+	def _word_windows_through(self, row, col):
+		# Count the occurrences of the word in every window that passes through (row, col)
+		data = self.grid.data
+		length = len(self.word)
+		count = 0
+		for dr, dc in DIRECTIONS:
+			for k in range(length):
+				start_row, start_col = row - k * dr, col - k * dc
+				end_row, end_col = start_row + (length - 1) * dr, start_col + (length - 1) * dc
+				if not (0 <= start_row < self.rows and 0 <= end_row < self.rows
+						and 0 <= start_col < self.cols and 0 <= end_col < self.cols):
+					continue
+				start = self.grid.index(start_row, start_col)
+				step = self.grid.offsets[(dr, dc)]
+				if all(data[start + i * step] == self.codes[i] for i in range(length)):
+					count += 1
+		return count
+
+	def _x_mas_centres_around(self, index):
+		# The cell is either the centre A of an X-MAS or one of its four diagonal corners
+		data = self.grid.data
+		offsets = self.grid.offsets
+		m, s, a = ord('M'), ord('S'), ord('A')
+		count = 0
+		for offset in (0, offsets[(-1, -1)], offsets[(-1, 1)], offsets[(1, -1)], offsets[(1, 1)]):
+			centre = index + offset
+			if data[centre] != a:
+				continue
+			first = data[centre + offsets[(-1, -1)]], data[centre + offsets[(1, 1)]]
+			second = data[centre + offsets[(-1, 1)]], data[centre + offsets[(1, -1)]]
+			if first in ((m, s), (s, m)) and second in ((m, s), (s, m)):
+				count += 1
+		return count
+
+
+def main():
+	result = check_string_in_rows(input_matrix, "XMAS")
+	print(result)
+
+	grid = Grid.from_file(file_path)
+	print(count_word(grid.as_array(), "XMAS"))
+	print(count_words(grid, ["XMAS", "MAS", "SAM"]))
+
+	result = count_a_with_diagonal_neighbours(test_matrix)
+	print(result)
+
+	print(count_x_mas(grid))
+
+
+if __name__ == "__main__":
+	main()
@@ -125,23 +125,60 @@ def calculate_middle_sum(updates):
 		middle_sum += update[middle_index]
 	return middle_sum
 
+class RuleIndex:
+	"""
+	Index over the page ordering rules, built once from parse_rules and reused for every update.
+
+	An update breaks a rule X|Y when Y is printed before X, so the index keeps the set of forbidden
+	(earlier, later) pairs and an update only has to look up the pairs of pages it actually contains.
+	When the rules form a total order over every page they mention, each page gets a rank and only the
+	k - 1 adjacent pairs of an update need checking.
+	"""
+	def __init__(self, rules):
+		self.rules = list(rules)
+		self.forbidden = {(second_page, first_page) for first_page, second_page in self.rules}
+		self.pages = {page for rule in self.rules for page in rule}
+		self.rank = self._total_order_rank()
+
+	def _total_order_rank(self):
+		# Rank of every page if the rules are a complete, acyclic order over all pages, otherwise None
+		page_count = len(self.pages)
+		ordered_pairs = set(self.rules)
+		unordered_pairs = {frozenset(rule) for rule in ordered_pairs}
+		pair_count = page_count * (page_count - 1) // 2
+		if len(ordered_pairs) != pair_count or len(unordered_pairs) != pair_count:
+			return None
+		predecessor_count = {page: 0 for page in self.pages}
+		for _, second_page in ordered_pairs:
+			predecessor_count[second_page] += 1
+		# A complete set of pairwise rules is acyclic exactly when the page ranked i has i predecessors
+		if sorted(predecessor_count.values()) != list(range(page_count)):
+			return None
+		return predecessor_count
+
+	def is_valid(self, update_pages):
+		if self.rank is not None:
+			ranks = [self.rank[page] for page in update_pages if page in self.rank]
+			return all(earlier < later for earlier, later in zip(ranks, ranks[1:]))
+
+		return self.follows_pairs(update_pages, self.forbidden)
+
+	@staticmethod
+	def follows_pairs(update_pages, forbidden):
+		# Pairwise check against a set of forbidden (earlier, later) pairs, for rule sets without a rank
+		for i, earlier in enumerate(update_pages):
+			for later in update_pages[i + 1:]:
+				if (earlier, later) in forbidden:
+					return False
+		return True
+
 def parse_updates(updates, rules):
 	valid_updates = []
+	rule_index = rules if isinstance(rules, RuleIndex) else RuleIndex(rules)
 
 	for update in updates:
 		update_pages = list(map(int, update.split(",")))
-		is_valid = True
-		for rule in rules:
-			first_page, second_page = rule
-			if first_page in update_pages and second_page in update_pages:
-				if update_pages.index(first_page) < update_pages.index(second_page):
-					continue
-				else:
-					is_valid = False
-					break
-			else:
-				continue
-		if is_valid:
+		if rule_index.is_valid(update_pages):
 			valid_updates.append(update_pages)
 	middle_sum = calculate_middle_sum(valid_updates)
 
@@ -153,11 +190,64 @@ def page_sorter(input):
 	middle_sum = parse_updates(updates, parsed_rules)
 	return middle_sum
 
-with open("Day5_input.txt") as file:
-	data = file.read()
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+def bulk_validate(updates, rules, batch_size=4096):
+	"""
+	Vectorized parse_updates. Updates are encoded as a position matrix (one column per page that appears in a
+	rule, holding the page's position in the update or -1 if absent) and the rules as two column index arrays,
+	so every rule is checked against every update in one NumPy operation per batch of updates.
+
+	:param updates: List of update strings from parse_input
+	:param rules: List of (first_page, second_page) tuples from parse_rules
+	:param batch_size: Number of updates evaluated per NumPy operation, bounds the size of the temporaries
+	:return: A tuple of (valid_mask, middle_sum) where middle_sum covers the valid updates only
+	"""
+	return bulk_validate_pages([list(map(int, update.split(","))) for update in updates], rules, batch_size)
+
+def bulk_validate_pages(update_pages, rules, batch_size=4096):
+	# bulk_validate over updates that are already lists of page numbers
+	if np is None:
+		raise ImportError("bulk_validate requires NumPy, use parse_updates without it.")
+	if not update_pages:
+		return np.zeros(0, dtype=bool), 0
+
+	columns = {page: i for i, page in enumerate(sorted({page for rule in rules for page in rule}))}
+	first_columns = np.array([columns[first_page] for first_page, _ in rules], dtype=np.int64)
+	second_columns = np.array([columns[second_page] for _, second_page in rules], dtype=np.int64)
+
+	positions = np.full((len(update_pages), len(columns)), -1, dtype=np.int32)
+	longest = max(len(pages) for pages in update_pages)
+	padded = np.zeros((len(update_pages), longest), dtype=np.int64)
+	lengths = np.zeros(len(update_pages), dtype=np.int64)
+	for row, pages in enumerate(update_pages):
+		padded[row, :len(pages)] = pages
+		lengths[row] = len(pages)
+		for position, page in enumerate(pages):
+			column = columns.get(page)
+			if column is not None:
+				positions[row, column] = position
+
+	valid = np.ones(len(update_pages), dtype=bool)
+	for start in range(0, len(update_pages), batch_size):
+		batch = positions[start:start + batch_size]
+		first_positions = batch[:, first_columns]
+		second_positions = batch[:, second_columns]
+		broken = (first_positions >= 0) & (second_positions >= 0) & (first_positions > second_positions)
+		valid[start:start + batch_size] = ~broken.any(axis=1)
+
+	middles = padded[np.arange(len(update_pages)), lengths // 2]
+	return valid, int(middles[valid].sum())
+
+def page_sorter_bulk(input):
+	rules, updates = parse_input(input)
+	parsed_rules = parse_rules(rules)
+	_, middle_sum = bulk_validate(updates, parsed_rules)
+	return middle_sum
 
-result = page_sorter(data)
-print(result)
 
 # --- Part Two ---
 # While the Elves get to work printing the correctly-ordered updates, you have a little time to fix the rest of them.
@@ -171,7 +261,10 @@ print(result)
 #
 # Find the updates which are not in the correct order. What do you get if you add up the middle page numbers after correctly ordering just those updates?
 
-from collections import defaultdict, deque
+import asyncio
+import sys
+from collections import OrderedDict, defaultdict, deque
+from functools import cmp_to_key, lru_cache
 
 
 def topological_sort(update_pages, rules):
@@ -208,19 +301,11 @@ def identify_invalid_updates(updates, rules):
 	valid_updates = []
 	invalid_updates = []
 
+	rule_index = rules if isinstance(rules, RuleIndex) else RuleIndex(rules)
+
 	for update in updates:
 		update_pages = list(map(int, update.split(",")))
-		is_valid = True
-		for rule in rules:
-			first_page, second_page = rule
-			if first_page in update_pages and second_page in update_pages:
-				if update_pages.index(first_page) < update_pages.index(second_page):
-					continue
-				else:
-					is_valid = False
-					break
-
-		if is_valid:
+		if rule_index.is_valid(update_pages):
 			valid_updates.append(update_pages)
 		else:
 			invalid_updates.append(update_pages)
@@ -228,30 +313,514 @@ def identify_invalid_updates(updates, rules):
 	return valid_updates, invalid_updates
 
 
+class RuleReachability:
+	"""
+	Transitive closure of the page ordering rules, stored as one Python int bitset per page.
+
+	The rule graph is split into strongly connected components (Tarjan), and the reachable set of every
+	component is built once from its successors, so "must X come before Y through any chain of rules" is a
+	single bit test. Note the puzzle only applies rules between pages that are both in an update, so the
+	closure is stricter than update validation and is used for ordering and cycle reporting instead.
+	"""
+	def __init__(self, rules):
+		self.rules = list(rules)
+		self.pages = sorted({page for rule in self.rules for page in rule})
+		self.bit = {page: i for i, page in enumerate(self.pages)}
+		self.successors = defaultdict(list)
+		for first_page, second_page in self.rules:
+			self.successors[first_page].append(second_page)
+
+		self.components = self._strongly_connected_components()
+		self.component_of = {page: c for c, component in enumerate(self.components) for page in component}
+		# Tarjan finds sink components first, so reversing the index gives a topological order
+		self.topological_index = [len(self.components) - 1 - c for c in range(len(self.components))]
+		self.reach = self._component_reach()
+
+	def _strongly_connected_components(self):
+		# Iterative Tarjan, components come out in reverse topological order
+		index = {}
+		low = {}
+		on_stack = set()
+		stack = []
+		components = []
+		counter = 0
+
+		for root in self.pages:
+			if root in index:
+				continue
+			work = [(root, iter(self.successors[root]))]
+			index[root] = low[root] = counter
+			counter += 1
+			stack.append(root)
+			on_stack.add(root)
+
+			while work:
+				page, successors = work[-1]
+				for successor in successors:
+					if successor not in index:
+						index[successor] = low[successor] = counter
+						counter += 1
+						stack.append(successor)
+						on_stack.add(successor)
+						work.append((successor, iter(self.successors[successor])))
+						break
+					if successor in on_stack:
+						low[page] = min(low[page], index[successor])
+				else:
+					work.pop()
+					if work:
+						parent = work[-1][0]
+						low[parent] = min(low[parent], low[page])
+					if low[page] == index[page]:
+						component = []
+						while True:
+							member = stack.pop()
+							on_stack.discard(member)
+							component.append(member)
+							if member == page:
+								break
+						components.append(sorted(component))
+		return components
+
+	def _component_reach(self):
+		reach = [0] * len(self.components)
+		for c, component in enumerate(self.components):
+			bits = 0
+			for page in component:
+				for successor in self.successors[page]:
+					bits |= 1 << self.bit[successor]
+					successor_component = self.component_of[successor]
+					if successor_component != c:
+						bits |= reach[successor_component]
+			reach[c] = bits
+		return reach
+
+	def must_precede(self, first_page, second_page):
+		if first_page not in self.bit or second_page not in self.bit:
+			return False
+		return bool(self.reach[self.component_of[first_page]] >> self.bit[second_page] & 1)
+
+	def is_cyclic(self, page):
+		return self.must_precede(page, page)
+
+	def cycle_report(self):
+		"""
+		Lists every strongly connected component of the rules that contains a cycle.
+
+		:return: A list of (component_pages, example_cycle) tuples, where example_cycle starts and ends on
+			the same page
+		"""
+		report = []
+		for component in self.components:
+			if self.is_cyclic(component[0]):
+				report.append((component, self._find_cycle(component[0], set(component))))
+		return report
+
+	def _find_cycle(self, start, component):
+		# Breadth first search inside the component for the shortest path back to start
+		parents = {}
+		queue = deque([start])
+		while queue:
+			page = queue.popleft()
+			for successor in self.successors[page]:
+				if successor not in component:
+					continue
+				if successor == start:
+					cycle = [start, page]
+					while cycle[-1] != start:
+						cycle.append(parents[cycle[-1]])
+					return cycle[::-1]
+				if successor not in parents:
+					parents[successor] = page
+					queue.append(successor)
+		return []
+
+class ReorderEngine:
+	"""
+	Reorders updates using a RuleIndex instead of rebuilding a graph from the full rule list per update.
+
+	When the rules are a total order the pages are sorted by their precomputed rank in O(k log k). Otherwise
+	each page is ranked by its number of predecessors within the update, k set intersections, which gives the
+	order whenever the rules between the update's own pages are a total order. If that breaks a rule they are
+	sorted with a comparator over the rule pairs and checked, and topological_sort is the last resort. Results
+	are cached in an LRU keyed by the set of pages, since the same page sets come up repeatedly.
+	"""
+	def __init__(self, rules, cache_size=4096):
+		self.rule_index = rules if isinstance(rules, RuleIndex) else RuleIndex(rules)
+		self.ordered_pairs = set(self.rule_index.rules)
+		self.predecessors = defaultdict(set)
+		for first_page, second_page in self.ordered_pairs:
+			self.predecessors[second_page].add(first_page)
+		self.reachability = RuleReachability(self.rule_index.rules)
+		self._reorder_page_set = lru_cache(maxsize=cache_size)(self._reorder_page_set)
+
+	def reorder(self, update_pages):
+		page_set = frozenset(update_pages)
+		if len(page_set) != len(update_pages):
+			# Repeated pages can't be keyed by their set
+			return self._reorder(update_pages)
+		return list(self._reorder_page_set(page_set))
+
+	def _reorder_page_set(self, page_set):
+		return tuple(self._reorder(list(page_set)))
+
+	def _reorder(self, update_pages):
+		rank = self.rule_index.rank
+		if rank is not None and all(page in rank for page in update_pages):
+			return sorted(update_pages, key=rank.__getitem__)
+
+		# Pages in different components can be ordered by the topological order of the components, which
+		# respects every rule between them
+		component_of = self.reachability.component_of
+		components = [component_of.get(page) for page in update_pages]
+		if None not in components and len(set(components)) == len(components):
+			topological_index = self.reachability.topological_index
+			return sorted(update_pages, key=lambda page: topological_index[component_of[page]])
+
+		reordered = self._sort_by_predecessor_count(update_pages)
+		if reordered is not None:
+			return reordered
+
+		reordered = sorted(update_pages, key=cmp_to_key(self._compare))
+		if self.rule_index.is_valid(reordered):
+			return reordered
+		return topological_sort(update_pages, self.rule_index.rules)
+
+	def _sort_by_predecessor_count(self, update_pages):
+		"""
+		Sorts the update by how many of its own pages must come before each page. When the rules between
+		the update's pages are a total order the counts are 0..k-1 and this is the order; the result is
+		checked by making sure every page's predecessors were placed before it.
+
+		:param update_pages: List of page numbers
+		:return: The reordered pages, or None if sorting by the counts breaks a rule
+		"""
+		page_set = set(update_pages)
+		if len(page_set) != len(update_pages):
+			return None
+		no_pages = frozenset()
+		before = {page: self.predecessors.get(page, no_pages) & page_set for page in page_set}
+		reordered = sorted(update_pages, key=lambda page: len(before[page]))
+		placed = set()
+		for page in reordered:
+			if not before[page] <= placed:
+				return None
+			placed.add(page)
+		return reordered
+
+	def _compare(self, first_page, second_page):
+		if (first_page, second_page) in self.ordered_pairs:
+			return -1
+		if (second_page, first_page) in self.ordered_pairs:
+			return 1
+		return 0
+
 def reorder_updates(updates, rules):
 	reordered_updates = []
+	engine = rules if isinstance(rules, ReorderEngine) else ReorderEngine(rules)
 	for update in updates:
 		try:
-			reordered = topological_sort(update, rules)
-			reordered_updates.append(reordered)
+			reordered_updates.append(engine.reorder(update))
 		except ValueError as e:
-			print(f"Skipping update {update}: {e}")
-			continue
+			# Dropping the update would silently change the middle sum, so fail with the update that caused it
+			raise ValueError(f"Cannot reorder update {update}: {e}") from e
 	return reordered_updates
 
+def describe_cycles(reachability):
+	# One line summary of RuleReachability.cycle_report, or None when the rules are acyclic
+	report = reachability.cycle_report()
+	if not report:
+		return None
+	cyclic_pages = sum(len(component) for component, _ in report)
+	_, example_cycle = report[0]
+	return (
+		f"Rules contain {len(report)} cyclic component(s) covering {cyclic_pages} pages, "
+		f"e.g. {' -> '.join(map(str, example_cycle))}"
+	)
+
 
 def main(input):
 	rules, updates = parse_input(input)
 	parsed_rules = parse_rules(rules)
-	valid_updates, invalid_updates = identify_invalid_updates(updates, parsed_rules)
-	reordered_updates = reorder_updates(invalid_updates, parsed_rules)
+	engine = ReorderEngine(parsed_rules)
+	cycles = describe_cycles(engine.reachability)
+	if cycles:
+		# Only rules between pages of the same update apply, so a rule cycle only matters when the rules
+		# between one update's own pages form a cycle, and reorder_updates raises for that update
+		print(cycles)
+	valid_updates, invalid_updates = identify_invalid_updates(updates, engine.rule_index)
+	reordered_updates = reorder_updates(invalid_updates, engine)
 	middle_sum = calculate_middle_sum(reordered_updates)
 	return middle_sum
 
 
-print(main(test_input))
+class UpdateTracker:
+	"""
+	Keeps every update's validity, reordered pages and both middle page sums current as rules are added or
+	removed. An inverted index from page to the updates containing it means a rule change only re-checks
+	and re-sorts the updates holding both of its pages.
+
+	Invalid updates whose own rules form a cycle have no valid order and are left out of reordered_middle_sum,
+	their ids are kept in unorderable so callers can tell the sum is incomplete.
+	"""
+	def __init__(self, rules, updates):
+		self.ordered_pairs = set(rules)
+		self.forbidden = {(second_page, first_page) for first_page, second_page in self.ordered_pairs}
+		self.updates = [list(map(int, update.split(","))) if isinstance(update, str) else list(update) for update in updates]
+		self.updates_with_page = defaultdict(set)
+		for update_id, update_pages in enumerate(self.updates):
+			for page in update_pages:
+				self.updates_with_page[page].add(update_id)
+
+		self.valid = [False] * len(self.updates)
+		self.reordered = [None] * len(self.updates)
+		self.unorderable = set()
+		# Middle page sum of the valid updates (part 1) and of the reordered invalid updates (part 2)
+		self.valid_middle_sum = 0
+		self.reordered_middle_sum = 0
+		for update_id in range(len(self.updates)):
+			self._refresh(update_id)
+
+	def add_rule(self, first_page, second_page):
+		if (first_page, second_page) not in self.ordered_pairs:
+			self.ordered_pairs.add((first_page, second_page))
+			self.forbidden.add((second_page, first_page))
+			self._refresh_affected(first_page, second_page)
+
+	def remove_rule(self, first_page, second_page):
+		if (first_page, second_page) in self.ordered_pairs:
+			self.ordered_pairs.remove((first_page, second_page))
+			self.forbidden.remove((second_page, first_page))
+			self._refresh_affected(first_page, second_page)
+
+	def _refresh_affected(self, first_page, second_page):
+		for update_id in self.updates_with_page[first_page] & self.updates_with_page[second_page]:
+			self._refresh(update_id)
+
+	def _refresh(self, update_id):
+		# Take the update's old contribution out of the sums, re-check it and add the new one back in
+		if self.valid[update_id]:
+			self.valid_middle_sum -= self._middle(self.updates[update_id])
+		elif self.reordered[update_id] is not None:
+			self.reordered_middle_sum -= self._middle(self.reordered[update_id])
+
+		update_pages = self.updates[update_id]
+		self.valid[update_id] = RuleIndex.follows_pairs(update_pages, self.forbidden)
+		self.reordered[update_id] = None
+		self.unorderable.discard(update_id)
+		if self.valid[update_id]:
+			self.valid_middle_sum += self._middle(update_pages)
+		else:
+			try:
+				self.reordered[update_id] = self._reorder(update_pages)
+				self.reordered_middle_sum += self._middle(self.reordered[update_id])
+			except ValueError:
+				# A cycle among this update's pages, it has no valid order until the rules change again
+				self.unorderable.add(update_id)
+
+	def _reorder(self, update_pages):
+		# Only the rules between the update's own pages matter, O(k^2) lookups instead of a scan of every rule
+		rules = [(first_page, second_page) for first_page in update_pages for second_page in update_pages
+				 if (first_page, second_page) in self.ordered_pairs]
+		return topological_sort(update_pages, rules)
+
+	@staticmethod
+	def _middle(update_pages):
+		return update_pages[len(update_pages) // 2]
+
+
+class PrintQueueService:
+	"""
+	Long-lived print queue service. The rules are parsed and indexed once, then updates arrive one per line
+	as "<command> <pages>", where command is validate, reorder or middle and pages is comma separated:
+
+		validate 75,47,61,53,29  ->  true
+		reorder 61,13,29         ->  61,29,13
+		middle 61,13,29          ->  29
+
+	Requests from every client go through one queue and are answered in batches. Within a batch identical
+	requests are answered once, the updates missing from the LRU result cache are validated together and only
+	the invalid ones are reordered. Clients don't wait for an answer before sending their next request, the
+	answers are written back in request order as they complete.
+	"""
+	def __init__(self, rules, batch_size=256, cache_size=65536):
+		self.rule_index = RuleIndex(rules)
+		self.engine = ReorderEngine(self.rule_index)
+		self.batch_size = batch_size
+		self.cache_size = cache_size
+		self.results = OrderedDict()
+		self.queue = None
+
+	@classmethod
+	def from_file(cls, file_path, **kwargs):
+		# Only the rule block of the input is used, any updates in the file are ignored
+		with open(file_path) as file:
+			rules, _ = parse_input(file.read())
+		return cls(parse_rules(rules), **kwargs)
+
+	def handle_line(self, line):
+		return self.handle_lines([line])[0]
+
+	def handle_lines(self, lines):
+		"""
+		Answers a batch of request lines.
+
+		:param lines: Request lines of the form "<command> <pages>"
+		:return: List of response strings, in the same order as lines
+		"""
+		requests = [self._parse_line(line) for line in lines]
+		answers = {}
+		for request in requests:
+			if isinstance(request, str) or request in answers:
+				continue
+			answers[request] = self.results.get(request)
+			if answers[request] is not None:
+				self.results.move_to_end(request)
+
+		missing = [request for request, answer in answers.items() if answer is None]
+		# validate, reorder and middle requests for the same update share one validity check
+		page_lists = list(dict.fromkeys(update_pages for _, update_pages in missing))
+		validity = dict(zip(page_lists, self._validate_all(page_lists)))
+		for command, update_pages in missing:
+			answer = self._answer(command, update_pages, validity[update_pages])
+			answers[command, update_pages] = answer
+			self.results[command, update_pages] = answer
+			if len(self.results) > self.cache_size:
+				self.results.popitem(last=False)
+
+		return [request if isinstance(request, str) else answers[request] for request in requests]
+
+	@staticmethod
+	def _parse_line(line):
+		# A (command, update_pages) request, or the error response for a malformed line
+		parts = line.split()
+		if len(parts) != 2:
+			return "error: expected '<command> <pages>'"
+		command, pages = parts
+		if command not in ("validate", "reorder", "middle"):
+			return f"error: unknown command {command!r}"
+		try:
+			return command, tuple(map(int, pages.split(",")))
+		except ValueError:
+			return f"error: invalid pages {pages!r}"
+
+	def _validate_all(self, page_lists):
+		if np is None or len(page_lists) < 2:
+			return [self.rule_index.is_valid(update_pages) for update_pages in page_lists]
+		valid, _ = bulk_validate_pages(page_lists, self.rule_index.rules, self.batch_size)
+		return valid.tolist()
+
+	def _answer(self, command, update_pages, valid):
+		if command == "validate":
+			return "true" if valid else "false"
+
+		update_pages = list(update_pages)
+		if not valid:
+			try:
+				update_pages = self.engine.reorder(update_pages)
+			except ValueError as e:
+				return f"error: {e}"
+		if command == "reorder":
+			return ",".join(map(str, update_pages))
+		return str(update_pages[len(update_pages) // 2])
+
+	def submit(self, line):
+		# Queues a request and returns the future of its answer without waiting for it
+		future = asyncio.get_running_loop().create_future()
+		self.queue.put_nowait((line, future))
+		return future
+
+	async def _process_batches(self):
+		while True:
+			batch = [await self.queue.get()]
+			while len(batch) < self.batch_size and not self.queue.empty():
+				batch.append(self.queue.get_nowait())
+			batch = [(line, future) for line, future in batch if not future.cancelled()]
+			try:
+				answers = self.handle_lines([line for line, _ in batch])
+			except Exception:
+				# Fall back to one line at a time so only the failing request gets the exception
+				for line, future in batch:
+					try:
+						future.set_result(self.handle_line(line))
+					except Exception as e:
+						future.set_exception(e)
+				continue
+			for (_, future), answer in zip(batch, answers):
+				future.set_result(answer)
+
+	@staticmethod
+	async def _send_responses(pending, send):
+		# Writes the answers of one client in request order, None marks the end of its requests
+		while (future := await pending.get()) is not None:
+			try:
+				response = await future
+			except Exception as e:
+				response = f"error: {e}"
+			await send(response)
+
+	async def _handle_client(self, reader, writer):
+		async def send(response):
+			writer.write(response.encode() + b"\n")
+			await writer.drain()
+
+		pending = asyncio.Queue(maxsize=self.batch_size)
+		sender = asyncio.create_task(self._send_responses(pending, send))
+		try:
+			while line := await reader.readline():
+				if line.strip():
+					await pending.put(self.submit(line.decode()))
+			await pending.put(None)
+			await sender
+		finally:
+			sender.cancel()
+			writer.close()
+
+	async def serve_unix(self, socket_path):
+		self.queue = asyncio.Queue()
+		batcher = asyncio.create_task(self._process_batches())
+		server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+		try:
+			async with server:
+				await server.serve_forever()
+		finally:
+			batcher.cancel()
+
+	async def serve_stdin(self):
+		async def send(response):
+			print(response, flush=True)
+
+		self.queue = asyncio.Queue()
+		batcher = asyncio.create_task(self._process_batches())
+		pending = asyncio.Queue(maxsize=self.batch_size)
+		sender = asyncio.create_task(self._send_responses(pending, send))
+		try:
+			while line := await asyncio.to_thread(sys.stdin.readline):
+				if line.strip():
+					await pending.put(self.submit(line))
+			await pending.put(None)
+			await sender
+		finally:
+			sender.cancel()
+			batcher.cancel()
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1 and sys.argv[1] == "serve":
+		# python Day5.py serve [socket_path], reads requests from stdin when no socket is given
+		service = PrintQueueService.from_file("Day5_input.txt")
+		if len(sys.argv) > 2:
+			asyncio.run(service.serve_unix(sys.argv[2]))
+		else:
+			asyncio.run(service.serve_stdin())
+	else:
+		with open("Day5_input.txt") as file:
+			data = file.read()
+
+		result = page_sorter(data)
+		print(result)
+		if np is not None:
+			print(page_sorter_bulk(data))
 
-with open("Day5_input.txt") as file:
-	data = file.read()
+		print(main(test_input))
 
-print(main(data))
\ No newline at end of file
+		print(main(data))
\ No newline at end of file
@@ -87,6 +87,10 @@
 #
 # Predict the path of the guard. How many distinct positions will the guard visit before leaving the mapped area?
 
+from bisect import bisect_left
+
+from Grid import Grid
+
 map_input = [
 	"....#.....",
 	".........#",
@@ -100,146 +104,31 @@ map_input = [
 	"......#..."
 ]
 
-def read_map(map_input):
-	start_position = None
-	guard_direction = None
-	updated_map = []
-
-	# Iterate through each row and character to find the guard and update the map
-	for row_index, row in enumerate(map_input):
-		new_row = ""
-		for col_index, char in enumerate(row):
-			if char in "^v<>":  # Identify the guard based on direction
-				start_position = (row_index, col_index)
-				guard_direction = char
-				new_row += "."  # Replace guard symbol with a space in the initial map
-			else:
-				new_row += char
-
-		updated_map.append(list(new_row))  # Convert rows to mutable lists for easy updates
-
-	return start_position, guard_direction, updated_map
-
-def process_guard_movement(map_input, guard_position, guard_direction):
-	row, col = guard_position
-	movement_string = check_guard_direction(row, col, guard_direction, map_input)
-
-	# Check for an obstacle and count steps
-	obstacle_index = movement_string.find('#')
-	if obstacle_index != -1:
-		obstacle_exists = True
-		spaces_until_obstacle = obstacle_index  # Spaces until the next obstacle
-		reached_edge = False  # Did not reach the edge, obstacle in the way
-	else:
-		obstacle_exists = False
-		spaces_until_obstacle = len(movement_string)  # The entire path until the edge
-		reached_edge = True  # Path leads to the edge of the map
-
-	return obstacle_exists, spaces_until_obstacle, reached_edge
-
-def check_guard_direction(row, col, guard_direction, map_input):
-	# Determine the string to check (row or column) based on movement direction
-	if guard_direction == '>':  # Moving right
-		movement_string = "".join(map_input[row][col + 1:])  # Extract from (col+1) to the end of the row
-	elif guard_direction == '<':  # Moving left
-		movement_string = "".join(
-			map_input[row][:col][::-1])  # Extract from start to (col) and reverse for left movement
-	elif guard_direction == 'v':  # Moving down
-		movement_string = "".join(map_input[i][col] for i in range(row + 1, len(map_input)))  # Extract column downward
-	elif guard_direction == '^':  # Moving up
-		movement_string = "".join(map_input[i][col] for i in range(row - 1, -1, -1))  # Extract column upward
-	else:
-		raise ValueError(f"Invalid guard direction: {guard_direction}")
-	return movement_string
-
-def update_guard_direction(direction):
-	direction_mapping = {
-		'>': 'v',  # Right to Down
-		'v': '<',  # Down to Left
-		'<': '^',  # Left to Up
-		'^': '>'  # Up to Right
-	}
-	return direction_mapping[direction]
-
-def update_map_with_guard_path(map_input, guard_position, spaces_to_move, guard_direction):
-	row, col = guard_position
-
-	for step in range(spaces_to_move):
-		# Mark the current position as visited
-		map_input[row][col] = "X"
-
-		# Update the guard's position based on the direction
-		if guard_direction == '>':  # Moving right
-			col += 1
-		elif guard_direction == '<':  # Moving left
-			col -= 1
-		elif guard_direction == 'v':  # Moving down
-			row += 1
-		elif guard_direction == '^':  # Moving up
-			row -= 1
-
-		# Stop marking if we reach the bounds of the map
-		# Guard has exited
-		if row < 0 or row >= len(map_input) or col < 0 or col >= len(map_input[0]):
-			break
-
-	# Ensure that the last valid position is marked before break
-	if 0 <= row < len(map_input) and 0 <= col < len(map_input[0]):
-		map_input[row][col] = "X"
-
-	return row, col
-
-
-def count_visited_spaces(map):
-	visited_spaces = 0
-	for row in map:
-		visited_spaces += row.count("X")
-	return visited_spaces
-
-def main(map_input):
-	start_position, guard_direction, updated_map = read_map(map_input)
-	current_position = start_position
-
-	step_number = 1
-
-	while True:
-		# print(f"Step {step_number}:")
-		# print(f"  Guard is currently at position {current_position} facing {guard_direction}.")
-
-		# Process guard's movement
-		obstacle_exists, spaces_to_move, reached_edge = process_guard_movement(updated_map, current_position,
-																			   guard_direction)
-
-		if reached_edge:
-			update_map_with_guard_path(updated_map, current_position, spaces_to_move,
-														  guard_direction)
-			break
-
-
-		current_position = update_map_with_guard_path(updated_map, current_position, spaces_to_move, guard_direction)
-
-		if obstacle_exists:
-			guard_direction = update_guard_direction(guard_direction)
+# Guard directions in clockwise order, so turning right is (direction + 1) % 4
+GUARD_DIRECTIONS = ['^', '>', 'v', '<']
+GUARD_STEPS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 
-		# print("\n")
-		step_number += 1
-
-	# Print and count the final results
-	# print("Final map after guard path traversal:")
-	# for row in updated_map:
-	# 	print("".join(row))
-
-	count = count_visited_spaces(updated_map)
-	# print(f"Total number of distinct positions visited by the guard: {count}")
-	return count, updated_map
-
-
-
-
-with open('Day6_input.txt', 'r') as f:
-	input = f.read()
-
-visisted_spaces, final_map = main(input.splitlines())
+def read_map(map_input):
+	"""
+	Loads the map into a compact Grid and takes the guard off it.
+
+	:param map_input: List of strings, one per row
+	:return: A tuple of (start_index, direction, grid), start_index is a flat Grid index and direction
+		an index into GUARD_DIRECTIONS
+	"""
+	grid = Grid.from_lines(map_input)
+	for direction, char in enumerate(GUARD_DIRECTIONS):
+		start_index = grid.find(char)
+		if start_index != -1:
+			grid.set(start_index, ord('.'))
+			return start_index, direction, grid
+	raise ValueError("No guard found on the map.")
+
+def part_1(map_input):
+	start_index, guard_direction, guard_map = read_map(map_input)
+	row, col = guard_map.position(start_index)
+	visited = GuardSimulation(guard_map).visited(row, col, guard_direction)
+	return visited.count(1)
 
 # --- Part Two ---
 # While The Historians begin working around the guard's patrol route, you borrow their fancy device and step outside the lab. From the safety of a supply closet, you time travel through the last few months and record the nightly status of the lab's guard post on the walls of the closet.
@@ -329,91 +218,105 @@ visisted_spaces, final_map = main(input.splitlines())
 #
 # You need to get the guard stuck in a loop by adding a single new obstruction. How many different positions could you choose for this obstruction?
 
-def check_obstructions(map_input, guard_position, guard_direction):
-	# Set to store visited states (position and direction)
-	obstructions = set()
-
-	# Current state of the guard
-	current_position = guard_position
-	current_direction = guard_direction
-
-	while True:
-		guard_state = (current_position[0], current_position[1], current_direction)
-
-		# Check if this state has been visited before
-		if guard_state in obstructions:
-			print(f"Loop detected: guard is stuck at state {guard_state}.")
-			return True  # Loop detected
-
-		# Add the current state to obstructions
-		obstructions.add(guard_state)
-
-		# Process the guard's movement
-		obstacle_exists, spaces_to_move, reached_edge = process_guard_movement(
-			map_input, current_position, current_direction
+class GuardSimulation:
+	"""
+	Guard walk over next-obstacle jump tables. The obstacles of every row and column are kept as sorted lists,
+	so each leg of the walk is one bisect to find the next obstacle instead of building the row or column as a
+	string and stepping cell by cell. Part 2 candidates are passed in as an extra obstruction and checked
+	against the current leg, so the tables are built once per map.
+	"""
+	def __init__(self, grid):
+		self.rows = grid.rows
+		self.cols = grid.cols
+		self.row_obstacles = [[] for _ in range(self.rows)]
+		self.col_obstacles = [[] for _ in range(self.cols)]
+		# find_all walks the cells in row order, so both sets of lists come out sorted
+		for index in grid.find_all('#'):
+			row, col = grid.position(index)
+			self.row_obstacles[row].append(col)
+			self.col_obstacles[col].append(row)
+
+	def next_stop(self, row, col, direction, extra=None):
+		"""
+		Jumps to the end of the current leg.
+
+		:param row: Guard row
+		:param col: Guard column
+		:param direction: Index into GUARD_DIRECTIONS
+		:param extra: Optional (row, col) of an added obstruction
+		:return: A tuple of (row, col, exited), the last cell before an obstacle or the edge of the map
+		"""
+		if direction == 0 or direction == 2:  # Moving up or down
+			obstacles = self.col_obstacles[col]
+			i = bisect_left(obstacles, row)
+			if direction == 0:
+				blocked = obstacles[i - 1] if i > 0 else -1
+				if extra is not None and extra[1] == col and blocked < extra[0] < row:
+					blocked = extra[0]
+				return (blocked + 1, col, False) if blocked >= 0 else (0, col, True)
+			blocked = obstacles[i] if i < len(obstacles) else self.rows
+			if extra is not None and extra[1] == col and row < extra[0] < blocked:
+				blocked = extra[0]
+			return (blocked - 1, col, False) if blocked < self.rows else (self.rows - 1, col, True)
+
+		obstacles = self.row_obstacles[row]
+		i = bisect_left(obstacles, col)
+		if direction == 3:  # Moving left
+			blocked = obstacles[i - 1] if i > 0 else -1
+			if extra is not None and extra[0] == row and blocked < extra[1] < col:
+				blocked = extra[1]
+			return (row, blocked + 1, False) if blocked >= 0 else (row, 0, True)
+		blocked = obstacles[i] if i < len(obstacles) else self.cols
+		if extra is not None and extra[0] == row and col < extra[1] < blocked:
+			blocked = extra[1]
+		return (row, blocked - 1, False) if blocked < self.cols else (row, self.cols - 1, True)
+
+	def visited(self, row, col, direction):
+		# Bitmap of row * cols + col for every cell on the guard's path, each leg marked with one slice write
+		visited = bytearray(self.rows * self.cols)
+		while True:
+			end_row, end_col, exited = self.next_stop(row, col, direction)
+			start = row * self.cols + col
+			end = end_row * self.cols + end_col
+			step = self.cols if col == end_col else 1
+			low, high = min(start, end), max(start, end)
+			visited[low:high + 1:step] = b"\x01" * ((high - low) // step + 1)
+			if exited:
+				return visited
+			row, col, direction = end_row, end_col, (direction + 1) % 4
+
+	def loops(self, row, col, direction, extra=None):
+		# Every loop has to turn, so only the turning states need remembering
+		seen = set()
+		while True:
+			row, col, exited = self.next_stop(row, col, direction, extra)
+			if exited:
+				return False
+			state = (row, col, direction)
+			if state in seen:
+				return True
+			seen.add(state)
+			direction = (direction + 1) % 4
+
+	def count_loop_positions(self, row, col, direction):
+		visited = self.visited(row, col, direction)
+		start = row * self.cols + col
+		return sum(
+			1 for index, was_visited in enumerate(visited)
+			if was_visited and index != start and self.loops(row, col, direction, divmod(index, self.cols))
 		)
 
-		# Update the map with the guard’s path
-		current_position = update_map_with_guard_path(
-			map_input, current_position, spaces_to_move, current_direction
-		)
-
-		# Check if the guard has exited the map
-		if reached_edge:
-			print(f"Guard has exited the map at {current_position}. No loop.")
-			return False  # No loop
-
-		# Update direction if an obstacle is encountered
-		if obstacle_exists:
-			current_direction = update_guard_direction(current_direction)
-
-def get_visited_locations(map_input):
-	visited_locations = set()  # Use a set to store unique visited positions
-
-	# Iterate through rows and columns of the map
-	for row_idx, row in enumerate(map_input):
-		for col_idx, cell in enumerate(row):
-			if cell == "X":  # Check if the cell is visited ("X")
-				visited_locations.add((row_idx, col_idx))  # Add (row_idx, col_idx) to the set
-
-	# Debug: Print visited locations
-	if len(visited_locations) == 0:
-		print("No visited locations ('X') found in the map.")
-	else:
-		print(f"Visited locations: {visited_locations}")
-
-	return visited_locations
-
-
-def check_all_obstructions(map_input, guard_position, guard_direction):
-	# Step 1: Track all visited locations
-	visited_locations = get_visited_locations(map_input)
-	print(f"Total number of visited locations: {len(visited_locations)}")
-
-	looping_positions = []  # To store locations that cause a loop
-
-	for position in visited_locations:
-		# Step 2: Modify the map to place an obstacle at the position
-		row, col = position
-		original_char = map_input[row][col]  # Save the original value
-		map_input[row][col] = '#'  # Mark as an obstacle
-
-		# Step 3: Check if the map now causes a loop
-		if check_obstructions(map_input, guard_position, guard_direction):
-			looping_positions.append(position)  # Record the position if it causes a loop
-
-		# Step 4: Restore the map
-		map_input[row][col] = original_char  # Reset the location
+def part_2(map_input):
+	start_index, guard_direction, guard_map = read_map(map_input)
+	row, col = guard_map.position(start_index)
+	return GuardSimulation(guard_map).count_loop_positions(row, col, guard_direction)
 
-	# Step 5: Return the looping positions
-	return looping_positions
+def main():
+	with open('Day6_input.txt', 'r') as f:
+		data = f.read().splitlines()
 
-def part_2():
-	start_position, guard_direction, updated_map = read_map(input.splitlines())
-	# print(updated_map)
-	_, final_map = main(input.splitlines())
-	# print(final_map)
-	looping_positions = check_all_obstructions(final_map, start_position, guard_direction)
-	return looping_positions
+	print(part_1(data))
+	print(part_2(data))
 
-print(len(part_2()))
+if __name__ == "__main__":
+	main()
@@ -86,6 +86,8 @@
 
 from itertools import combinations
 
+from Grid import Grid
+
 test_input = [
 	"............",
 	"........0...",
@@ -105,50 +107,40 @@ test_input = [
 class AsciiMap:
 	def __init__(self, ascii_map_string):
 		self.start_map = self.ascii_map_parser(ascii_map_string)
-		self.height = len(self.start_map)
-		self.width = len(self.start_map[0]) if self.height > 0 else 0
+		self.height = self.start_map.rows
+		self.width = self.start_map.cols
 		self.antennas = {}
-		self.antinode_map = self.start_map.copy()
+		self.antinode_map = self.start_map.clone()
 
 	def ascii_map_parser(self, map_string):
 		"""
 		Parse a list of strings into a validated ASCII map.
 
 		:param map_strings: List of strings, where each string represents a row of the ASCII map.
-		:return: A list of lists representing the ASCII map (each inner list is a row of characters).
+		:return: A compact Grid holding the ASCII map.
 		:raises ValueError: If the input is invalid (e.g., inconsistent row lengths).
 		"""
-		if not map_string or not all(isinstance(row, str) for row in map_string):
-			raise ValueError("Input must be a non-empty list of strings.")
-
-		# Ensure all rows have the same width for a rectangular ASCII map
-		row_length = len(map_string[0])
-		if any(len(row) != row_length for row in map_string):
-			raise ValueError("All rows in the ASCII map must have the same length.")
-
-		# Convert strings into a 2D list of characters
-		return [list(row) for row in map_string]
+		return Grid.from_lines(map_string)
 
 	def get_char(self, x, y):
-		if y < 0 or y >= self.height or x < 0 or x >= self.width:
-			raise IndexError("Position out of map bounds!")
-		return self.start_map[y][x]
+		return self.start_map[y, x]
 
 	def set_char(self, x, y, char, map=None):
 		if map is None:  # Default to self.antinode_map if no map is provided
 			map = self.antinode_map
-		if y < 0 or y >= self.height or x < 0 or x >= self.width:
-			raise IndexError("Position out of map bounds!")
-		map[y][x] = char
+		map[y, x] = char
 
 	def find_antennas(self):
 		antenna_dict = {}
-		for y, row in enumerate(self.start_map):
-			for x, char in enumerate(row):
-				if char != '.':  # If the character is not a dot
-					if char not in antenna_dict:
-						antenna_dict[char] = []
-					antenna_dict[char].append((x, y))
+		data = self.start_map.data
+		empty = ord('.')
+		for index in self.start_map.indices():
+			if data[index] != empty:  # If the character is not a dot
+				char = chr(data[index])
+				y, x = self.start_map.position(index)
+				if char not in antenna_dict:
+					antenna_dict[char] = []
+				antenna_dict[char].append((x, y))
 		self.antennas = antenna_dict
 
 	def list_antennas(self):
@@ -224,12 +216,12 @@ class AsciiMap:
 		print(f" Antinodes: {len(self.antinodes)}")
 
 	def print_antinode_map(self):
-		for row in self.antinode_map:
-			print(row)
+		for row in self.antinode_map.lines():
+			print(list(row))
 
 	def print_start_map(self):
-		for row in self.start_map:
-			print(row)
+		for row in self.start_map.lines():
+			print(list(row))
 
 
 
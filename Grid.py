@@ -0,0 +1,153 @@
+# Shared compact character grid used by the map and word search puzzles (Day 4, Day 6 and Day 8).
+#
+# The grid is stored as a single contiguous bytearray with a one cell sentinel border all the way round.
+# Cell (row, col) lives at flat index (row + 1) * stride + (col + 1), so moving in any direction is a single
+# integer addition and walking off the map lands on a SENTINEL byte instead of needing bounds checks.
+
+# NumPy is only needed for as_array
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+SENTINEL = 0
+
+DIRECTIONS = [
+	(-1, -1), (-1, 0), (-1, 1),  # Up-left, up, up-right
+	(0, -1), (0, 1),  # Left,      right
+	(1, -1), (1, 0), (1, 1)  # Down-left, down, down-right
+]
+
+
+class Grid:
+	def __init__(self, data, rows, cols, readonly=False, shared=False):
+		self.data = data
+		self.rows = rows
+		self.cols = cols
+		self.stride = cols + 2
+		self.readonly = readonly
+		# Set when the buffer is shared with a clone and has to be copied before the first write
+		self._shared = shared
+		# Flat index offset for each (row, col) direction
+		self.offsets = {(dr, dc): dr * self.stride + dc for dr, dc in DIRECTIONS}
+
+	@classmethod
+	def from_lines(cls, lines):
+		"""
+		Builds a grid from a list of strings, one per row.
+
+		:param lines: List of equal length strings
+		:return: A Grid
+		:raises ValueError: If the input is empty, not strings, not ASCII, or the rows have different lengths
+		"""
+		if not lines or not all(isinstance(row, str) for row in lines):
+			raise ValueError("Input must be a non-empty list of strings.")
+
+		cols = len(lines[0])
+		if any(len(row) != cols for row in lines):
+			raise ValueError("All rows in the ASCII map must have the same length.")
+
+		# One byte per cell, so non-ASCII input raises (UnicodeEncodeError) instead of breaking the stride
+		return cls._from_rows([row.encode('ascii') for row in lines], cols)
+
+	@classmethod
+	def from_file(cls, file_path):
+		"""
+		Builds a grid from a file, one row per non-empty line.
+
+		:param file_path: Path to the grid file
+		:return: A Grid
+		"""
+		with open(file_path, 'rb') as f:
+			rows = [line.rstrip(b"\r\n") for line in f]
+		rows = [row for row in rows if row]
+		if not rows:
+			raise ValueError(f"{file_path} does not contain a grid.")
+
+		cols = len(rows[0])
+		if any(len(row) != cols for row in rows):
+			raise ValueError("All rows in the ASCII map must have the same length.")
+
+		return cls._from_rows(rows, cols)
+
+	@classmethod
+	def _from_rows(cls, rows, cols):
+		border = bytes(cols + 2)
+		data = bytearray(border)
+		for row in rows:
+			data += b"\0" + row + b"\0"
+		data += border
+		return cls(data, len(rows), cols)
+
+	def index(self, row, col):
+		return (row + 1) * self.stride + col + 1
+
+	def position(self, index):
+		row, col = divmod(index, self.stride)
+		return row - 1, col - 1
+
+	def in_bounds(self, row, col):
+		return 0 <= row < self.rows and 0 <= col < self.cols
+
+	def __getitem__(self, position):
+		row, col = position
+		if not self.in_bounds(row, col):
+			raise IndexError("Position out of map bounds!")
+		return chr(self.data[self.index(row, col)])
+
+	def __setitem__(self, position, char):
+		row, col = position
+		if not self.in_bounds(row, col):
+			raise IndexError("Position out of map bounds!")
+		self.set(self.index(row, col), ord(char))
+
+	def set(self, index, value):
+		# Write a byte at a flat index, copying a shared buffer first
+		if self.readonly:
+			raise TypeError("Cannot modify a read-only grid view.")
+		if self._shared:
+			self.data = bytearray(self.data)
+			self._shared = False
+		self.data[index] = value
+
+	def indices(self):
+		# Flat indices of every real (non-sentinel) cell, in row order
+		for row in range(self.rows):
+			start = (row + 1) * self.stride + 1
+			yield from range(start, start + self.cols)
+
+	def find(self, char):
+		# Flat index of the first cell holding char, or -1
+		return self.data.find(char.encode())
+
+	def find_all(self, char):
+		code = ord(char)
+		return [index for index in self.indices() if self.data[index] == code]
+
+	def count(self, char):
+		return self.data.count(char.encode())
+
+	def row(self, row):
+		start = (row + 1) * self.stride + 1
+		return self.data[start:start + self.cols].decode()
+
+	def lines(self):
+		return [self.row(row) for row in range(self.rows)]
+
+	def view(self):
+		# Read-only snapshot sharing the buffer, the source copies it before its next write so the view never changes
+		self._shared = True
+		return Grid(self.data, self.rows, self.cols, readonly=True, shared=True)
+
+	def clone(self):
+		# Copy-on-write clone, the buffer is only copied by whichever grid is written to first
+		self._shared = True
+		return Grid(self.data, self.rows, self.cols, shared=True)
+
+	def as_array(self):
+		# 2D uint8 NumPy view of the cells (without the border) sharing the same buffer
+		if np is None:
+			raise ImportError("Grid.as_array needs NumPy, the rest of Grid works without it.")
+		padded = np.frombuffer(self.data, dtype=np.uint8).reshape(self.rows + 2, self.stride)
+		padded.flags.writeable = False
+		return padded[1:-1, 1:-1]